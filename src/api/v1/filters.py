@@ -1,6 +1,4 @@
 import django_filters
-from django.db.models import F, Sum
-from django.db.models.query import QuerySet
 from django.utils.translation import gettext_lazy as _
 
 from collectings.models import Collect, Occasion
@@ -8,39 +6,6 @@ from core.models import BaseModel
 from organizations.models import Organization, Problem, Region
 
 
-class BaseOrderingFilter(django_filters.OrderingFilter):
-    """Базовый класс сортировки."""
-
-    def _annotate_count_amount(
-            self, query: str, qs: QuerySet, values: list
-    ) -> QuerySet:
-        """Просчитывает общее количество пожертвований."""
-        count_amount = ('count_amount', '-count_amount')
-        if values and any(value in count_amount for value in values):
-            return qs.annotate(count_amount=Sum(F(query)))
-        return qs
-
-
-class CollectOrderingFilter(BaseOrderingFilter):
-    """Кастомная сортировка группового денежного сбора."""
-
-    def filter(self, qs: QuerySet, values: list) -> QuerySet:
-        qs = self._annotate_count_amount(
-            'payments__payment_amount', qs, values
-            )
-        return super().filter(qs, values)
-
-
-class OrganizationOrderingFilter(BaseOrderingFilter):
-    """Кастомная сортировка некоммерческих организаций"""
-
-    def filter(self, qs: QuerySet, values: list) -> QuerySet:
-        qs = self._annotate_count_amount(
-            'collectings__payments__payment_amount', qs, values
-            )
-        return super().filter(qs, values)
-
-
 class BaseFilter(django_filters.FilterSet):
     """Базовый класс фильтра."""
 
@@ -68,12 +33,12 @@ class OrganizationFilter(BaseFilter):
         to_field_name='slug',
         label=Region._meta.get_field('slug').verbose_name,
         )
-    order_by = OrganizationOrderingFilter(
+    order_by = django_filters.OrderingFilter(
         fields={
-            'count_amount': 'count_amount',
+            'collected_amount': 'count_amount',
         },
         field_labels={
-            'count_amount': _('Сумма пожертвований сборов'),
+            'collected_amount': _('Сумма пожертвований сборов'),
         }
     )
 
@@ -110,18 +75,18 @@ class CollectFilter(BaseFilter):
         field_name='is_active',
         label=Collect._meta.get_field('is_active').verbose_name,
         )
-    order_by = CollectOrderingFilter(
+    order_by = django_filters.OrderingFilter(
         fields={
             'is_active': 'is_active',
             'create_datetime': 'create_datetime',
-            'count_amount': 'count_amount',
+            'collected_amount': 'count_amount',
         },
         field_labels={
             'is_active': Collect._meta.get_field('is_active').verbose_name,
             'create_datetime': Collect._meta.get_field(
                 'create_datetime'
                 ).verbose_name,
-            'count_amount': _('Сумма пожертвований сбора'),
+            'collected_amount': _('Сумма пожертвований сбора'),
         }
     )
 
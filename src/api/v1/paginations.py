@@ -1,5 +1,25 @@
+import json
+from base64 import b64decode, b64encode
+from itertools import groupby
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Func, Model, Q, QuerySet, Value
+from django.db.models.lookups import GreaterThan, LessThan
 from django.utils.translation import gettext_lazy as _
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from core.constants import COLLECT_PAYMENTS_PAGE_SIZE
+
+
+class Row(Func):
+    """Значение строки из нескольких выражений для их сравнения."""
+
+    template = '(%(expressions)s)'
+    output_field = Field()
 
 
 class BasePagination(LimitOffsetPagination):
@@ -21,3 +41,209 @@ class OrganizationPagination(BasePagination):
 
 class CollectPagination(BasePagination):
     """Limit offset групповых денежных сборов."""
+
+
+class CollectPaymentPagination(CursorPagination):
+    """Cursor платежей для сбора, от новых к старым."""
+
+    cursor_query_description = _('Значение курсора пагинации.')
+    page_size = COLLECT_PAYMENTS_PAGE_SIZE
+    ordering = ('-create_datetime', '-id')
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset пагинация по сортировке запроса.
+
+    Курсор хранит значения полей сортировки крайнего объекта страницы
+    и первичный ключ, поэтому страница отбирается условием по индексу,
+    без OFFSET и подсчёта общего количества.
+    """
+
+    cursor_query_description = _(
+        'Значение курсора пагинации, пустое для первой страницы.'
+        )
+    page_size_query_param = 'limit'
+    page_size_query_description = BasePagination.limit_query_description
+    page_size = BasePagination.default_limit
+    max_page_size = BasePagination.max_limit
+
+    def get_ordering(
+            self, request: Request, queryset: QuerySet[Model], view: APIView,
+            ) -> list[str]:
+        """Отдаёт сортировку запроса с первичным ключом в конце."""
+        ordering = list(queryset.query.order_by)
+        if not ordering and queryset.query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        names = {field.lstrip('-') for field in ordering}
+        if not names & {'pk', queryset.model._meta.pk.name}:
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def get_row_filter(self, position: list, lookup: str) -> Q:
+        """
+        Отдаёт сравнение строки полей одного направления с позицией.
+
+        Сравнение (a, pk) < (x, y) использует составной индекс
+        как один диапазон.
+        """
+        names = [name for name, _ in position]
+        values = [value for _, value in position]
+        if len(position) == 1:
+            return Q(**{f'{names[0]}__{lookup}': values[0]})
+        comparison = LessThan if lookup == 'lt' else GreaterThan
+        return Q(comparison(
+            Row(*map(F, names)), Row(*map(Value, values)),
+            ))
+
+    def get_keyset_filter(self, values: list, reverse: bool) -> Q:
+        """
+        Отдаёт условие отбора объектов после позиции курсора.
+
+        Соседние поля одного направления сравниваются строкой. При разных
+        направлениях условие дополняется границей по первому полю,
+        чтобы отбор шёл по диапазону индекса.
+        """
+        groups = [
+            (lookup, [(name, value) for name, value, _ in group])
+            for lookup, group in groupby(
+                (
+                    (
+                        field.lstrip('-'), value,
+                        'lt' if field.startswith('-') != reverse else 'gt',
+                        )
+                    for field, value in zip(self.ordering, values)
+                    ),
+                key=lambda item: item[2],
+                )
+            ]
+        keyset_filter = None
+        for lookup, position in reversed(groups):
+            condition = self.get_row_filter(position, lookup)
+            if keyset_filter is not None:
+                condition |= Q(*position) & keyset_filter
+            keyset_filter = condition
+        if len(groups) > 1:
+            lookup, ((name, value), *_) = groups[0]
+            keyset_filter &= Q(**{f'{name}__{lookup}e': value})
+        return keyset_filter
+
+    def get_ordering_field(
+            self, queryset: QuerySet[Model], name: str,
+            ) -> Field:
+        """Отдаёт поле модели или аннотации, по которому идёт сортировка."""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        model = queryset.model
+        *relations, name = name.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    def to_python_position(
+            self, queryset: QuerySet[Model], values: list,
+            ) -> list:
+        """
+        Приводит значения курсора к типам полей сортировки.
+
+        Пустые, составные и неверного типа значения дают 404,
+        как и повреждённый курсор.
+        """
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                self.get_ordering_field(
+                    queryset, field.lstrip('-'),
+                    ).to_python(value)
+                for field, value in zip(self.ordering, values)
+                ]
+        except (TypeError, ValueError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, obj: Model | dict) -> list:
+        """Отдаёт значения полей сортировки объекта или строки values()."""
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(obj, dict):
+            return [obj[name] for name in names]
+        return [getattr(obj, name) for name in names]
+
+    def paginate_queryset(
+            self,
+            queryset: QuerySet[Model],
+            request: Request,
+            view: APIView | None = None,
+            ) -> list[Model] | None:
+        """Отдаёт страницу после или перед позицией курсора."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        values, reverse = self.cursor or (None, False)
+        if values is not None:
+            values = self.to_python_position(queryset, values)
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        names = [field.lstrip('-') for field in ordering]
+        values_select = queryset.query.values_select
+        fields, defer = queryset.query.deferred_loading
+        if values_select:
+            queryset = queryset.values(
+                *dict.fromkeys((*values_select, *names)),
+                )
+        elif fields and not defer:
+            queryset = queryset.only(*fields, *names)
+        if values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(values, reverse))
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        return self.page
+
+    def decode_cursor(self, request: Request) -> tuple[list, bool] | None:
+        """Отдаёт позицию и направление из параметра курсора."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values: list, reverse: bool) -> str:
+        """Отдаёт ссылку на страницу от позиции."""
+        cursor = json.dumps({'p': values, 'r': int(reverse)}, default=str)
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            b64encode(cursor.encode()).decode('ascii'),
+            )
+
+    def get_next_link(self) -> str | None:
+        """Отдаёт ссылку на следующую страницу."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self) -> str | None:
+        """Отдаёт ссылку на предыдущую страницу."""
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
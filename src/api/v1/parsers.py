@@ -0,0 +1,34 @@
+from typing import IO, Any
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from api.v1.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    Разбор JSON через orjson.
+
+    Тело в кодировке, отличной от UTF-8, разбирает JSONParser.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(
+            self,
+            stream: IO[bytes],
+            media_type: str | None = None,
+            parser_context: dict | None = None,
+            ) -> Any:
+        """Отдаёт данные тела запроса."""
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
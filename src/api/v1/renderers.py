@@ -0,0 +1,47 @@
+from typing import Any
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS |
+    orjson.OPT_PASSTHROUGH_DATETIME |
+    orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Вывод JSON через orjson.
+
+    Даты, Decimal, ленивые строки перевода и другие типы, которые
+    orjson не выводит сам, передаются кодировщику DRF, поэтому
+    результат совпадает с JSONRenderer. Вывод с отступами или в ASCII
+    и значения, не поддерживаемые orjson, выводит JSONRenderer.
+    """
+
+    def render(
+            self,
+            data: Any,
+            accepted_media_type: str | None = None,
+            renderer_context: dict | None = None,
+            ) -> bytes:
+        """Отдаёт данные в JSON."""
+        if data is None:
+            return b''
+        if (
+            self.ensure_ascii or not self.compact or
+            self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+                )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028',
+            ).replace('\u2029'.encode(), b'\\u2029')
@@ -4,6 +4,7 @@ from urllib.parse import parse_qs, urlparse
 from django.db.models import Model
 from django.utils.timezone import localdate
 from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from youtube_urls_validator import validate_url
 from youtube_urls_validator.utils.exceptions import (
@@ -11,10 +12,65 @@ from youtube_urls_validator.utils.exceptions import (
 
 from api.v1.fields import Base64ImageField, Base64ImageOrSlugField
 from collectings.models import Collect, DefaultCover, Occasion, Payment
+from core.constants import (COLLECT_LATEST_PAYMENTS, FIELDS_PARAM, OMIT_PARAM,
+                            ROLLUP_PERIODS)
 from organizations.models import Organization, Problem, Region
-from utils.castom_fields import (get_count_amount_collect,
-                                 get_count_amount_organization,
-                                 get_count_donaters_collect)
+
+
+def get_fields_tree(values: list[str]) -> dict[str, dict]:
+    """Отдаёт дерево полей из значений вида 'name,organization.name'."""
+    tree = {}
+    for value in values:
+        for path in value.split(','):
+            node = tree
+            for name in filter(None, path.strip().split('.')):
+                node = node.setdefault(name, {})
+    return tree
+
+
+def select_fields(
+        fields: dict[str, serializers.Field],
+        include: dict[str, dict],
+        omit: dict[str, dict],
+        ) -> None:
+    """Оставляет выбранные поля и убирает исключённые."""
+    for name in list(fields):
+        if include and name not in include or name in omit and not omit[name]:
+            fields.pop(name)
+    for name, field in fields.items():
+        field = getattr(field, 'child', field)
+        nested_include = include.get(name, {})
+        nested_omit = omit.get(name, {})
+        if (
+            isinstance(field, serializers.Serializer) and
+            (nested_include or nested_omit)
+        ):
+            select_fields(field.fields, nested_include, nested_omit)
+
+
+class SparseFieldsMixin:
+    """
+    Выбор выводимых полей параметрами запроса fields и omit.
+
+    Вложенные поля указываются через точку. Выбор применяется
+    к корневому сериализатору, который передаёт его вложенным.
+    """
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        """Отдаёт поля с учётом выбора из запроса."""
+        fields = super().get_fields()
+        request = self.context.get('request')
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if request is None or parent is not None:
+            return fields
+        select_fields(
+            fields,
+            get_fields_tree(request.query_params.getlist(FIELDS_PARAM)),
+            get_fields_tree(request.query_params.getlist(OMIT_PARAM)),
+            )
+        return fields
 
 
 class BaseSerializer(serializers.ModelSerializer):
@@ -89,21 +145,25 @@ class RegionSerializer(BaseSerializer):
         model = Region
 
 
-class OrganizationSerializer(CollectOrganizationBaseSerializer):
+class OrganizationSerializer(
+    SparseFieldsMixin, CollectOrganizationBaseSerializer,
+):
     """Сериализатор некоммерческих организаций."""
 
-    count_amount = serializers.SerializerMethodField()
+    count_amount = serializers.IntegerField(
+        source='collected_amount', read_only=True,
+        )
+    count_donaters = serializers.IntegerField(
+        source='donors_count', read_only=True,
+        )
 
     class Meta(CollectOrganizationBaseSerializer.Meta):
         model = Organization
         fields = CollectOrganizationBaseSerializer.Meta.fields + [
             'count_amount',
+            'count_donaters',
         ]
 
-    def get_count_amount(self, obj: Organization) -> int | None:
-        """Собранная сумма."""
-        return get_count_amount_organization(obj)
-
 
 class PaymentSerializer(CollectPaymentBaseSerializer):
     """Сериализатор платежей для сбора."""
@@ -206,8 +266,12 @@ class CollectCreateSerializer(
         queryset=Occasion.objects.all(),
         slug_field='slug',
         )
-    count_amount = serializers.SerializerMethodField()
-    count_donaters = serializers.SerializerMethodField()
+    count_amount = serializers.IntegerField(
+        source='collected_amount', read_only=True,
+        )
+    count_donaters = serializers.IntegerField(
+        source='donors_count', read_only=True,
+        )
 
     class Meta(CollectUpdateSerializer.Meta):
         fields = (
@@ -219,32 +283,52 @@ class CollectCreateSerializer(
             ]
         )
 
-    def get_count_amount(self, obj: Collect) -> int | None:
-        """Собранная сумма."""
-        return get_count_amount_collect(obj)
-
-    def get_count_donaters(self, obj: Collect) -> int:
-        """Количество пожертвований."""
-        return get_count_donaters_collect(obj)
 
-
-class CollectResponseSerializer(
-    CollectCreateSerializer
+class CollectListSerializer(
+    SparseFieldsMixin, CollectCreateSerializer,
 ):
-    """Сериализатор вывода групповых денежных сборов."""
+    """Сериализатор вывода списка групповых денежных сборов."""
 
     organization = OrganizationSerializer()
     occasion = OccasionSerializer()
-    payments = PaymentSerializer(many=True)
 
     class Meta(CollectCreateSerializer.Meta):
         fields = (
             CollectCreateSerializer.Meta.fields + [
                 'is_active',
+            ]
+        )
+
+
+class CollectResponseSerializer(
+    CollectListSerializer
+):
+    """
+    Сериализатор вывода группового денежного сбора.
+
+    Выводит только последние COLLECT_LATEST_PAYMENTS платежей,
+    остальные доступны в списке платежей сбора.
+    """
+
+    payments = serializers.SerializerMethodField()
+
+    class Meta(CollectListSerializer.Meta):
+        fields = (
+            CollectListSerializer.Meta.fields + [
                 'payments',
             ]
         )
 
+    @extend_schema_field(PaymentSerializer(many=True))
+    def get_payments(self, obj: Collect) -> list[dict]:
+        """Отдаёт последние платежи для сбора."""
+        payments = obj.payments.order_by(
+            '-create_datetime', '-id',
+            )[:COLLECT_LATEST_PAYMENTS]
+        return PaymentSerializer(
+            payments, many=True, context=self.context,
+            ).data
+
 
 class ConfirmationUrlSerializer(serializers.Serializer):
     """Сериализатор ссылки на оплату."""
@@ -253,3 +337,54 @@ class ConfirmationUrlSerializer(serializers.Serializer):
 
     class Meta:
         fields = ('confirmation_url',)
+
+
+class PaymentIntentSerializer(serializers.Serializer):
+    """Сериализатор записанного намерения оплаты."""
+
+    id = serializers.IntegerField()
+    status_url = serializers.URLField()
+
+    class Meta:
+        fields = ('id', 'status_url')
+
+
+class PaymentConfirmationSerializer(serializers.ModelSerializer):
+    """Сериализатор статуса создания платежа и ссылки на оплату."""
+
+    class Meta:
+        model = Payment
+        fields = ('id', 'status', 'intent_status', 'confirmation_url')
+
+
+class LiveTotalsSerializer(serializers.Serializer):
+    """Сериализатор текущих итогов сбора."""
+
+    count_amount = serializers.IntegerField()
+    count_donaters = serializers.IntegerField()
+
+    class Meta:
+        fields = ('count_amount', 'count_donaters')
+
+
+class StatsQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров запроса итогов за период."""
+
+    period = serializers.ChoiceField(choices=ROLLUP_PERIODS, default='day')
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+
+    class Meta:
+        fields = ('period', 'date_from', 'date_to')
+
+
+class DonationRollupSerializer(serializers.Serializer):
+    """Сериализатор итогов пожертвований за период."""
+
+    start = serializers.DateTimeField()
+    amount = serializers.IntegerField()
+    payments_count = serializers.IntegerField()
+    donors_count = serializers.IntegerField()
+
+    class Meta:
+        fields = ('start', 'amount', 'payments_count', 'donors_count')
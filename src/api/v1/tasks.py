@@ -1,10 +1,19 @@
 from django.conf import settings
 from django.core.mail import send_mail
 from django.utils.timezone import localdate
+from requests import RequestException
+from yookassa.domain.exceptions import ApiError
 
 from collectings.models import Collect
 from config.celery import app
-from utils.payments import check_payments
+from core.constants import (LIVE_COUNTERS_CHUNK_SIZE,
+                            PAYMENT_INTENT_MAX_RETRIES,
+                            PAYMENT_INTENT_RETRY_DELAY, ROLLUP_CHUNK_SIZE)
+from utils.cache_warming import warm_cache
+from utils.live_counters import reconcile_active_live_counters
+from utils.payments import (check_payments, create_payment_intent,
+                            fail_payment_intent)
+from utils.rollups import rollup_donations
 
 
 @app.task
@@ -27,6 +36,30 @@ def check_payments_celery() -> None:
     check_payments()
 
 
+@app.task(bind=True, max_retries=PAYMENT_INTENT_MAX_RETRIES)
+def create_payment_intent_celery(self, payment_id: int) -> None:
+    """
+    Создаёт платёж в ЮKassa и отправляет ссылку на оплату.
+
+    При ошибке запроса задача повторяется, после последней попытки
+    платёж отмечается ошибкой создания.
+    """
+    try:
+        payment = create_payment_intent(payment_id)
+    except (ApiError, RequestException) as exc:
+        if self.request.retries >= self.max_retries:
+            fail_payment_intent(payment_id)
+            return
+        raise self.retry(exc=exc, countdown=PAYMENT_INTENT_RETRY_DELAY)
+    if payment is not None and payment.user is not None:
+        send_mail_celery.delay(
+            'Create payment',
+            'Платеж для сбора создан. '
+            f'Оплатите по ссылке: {payment.confirmation_url}',
+            (payment.user.email,)
+        )
+
+
 @app.task
 def check_close_datetime_collect() -> None:
     """
@@ -35,3 +68,21 @@ def check_close_datetime_collect() -> None:
     Collect.objects.filter(
         close_datetime__date__lte=localdate()
         ).update(is_active=False)
+
+
+@app.task
+def warm_cache_celery(tag_cache: str) -> None:
+    """Заполняет кэш популярных страниц тега."""
+    warm_cache((tag_cache,))
+
+
+@app.task
+def reconcile_live_counters_celery() -> None:
+    """Сверяет счётчики активных сборов с итогами в БД."""
+    reconcile_active_live_counters(LIVE_COUNTERS_CHUNK_SIZE)
+
+
+@app.task
+def rollup_donations_celery() -> None:
+    """Переносит новые платежи в итоги за период."""
+    rollup_donations(ROLLUP_CHUNK_SIZE)
@@ -2,9 +2,11 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 
-from api.v1.views import (CastomTokenObtainPairView, CastomUserViewSet,
-                          CollectViewSet, DefaultCoverView, OccasionView,
-                          OrganizationView, PaymentView, ProblemView,
+from api.v1.views import (CacheMetricsView, CastomTokenObtainPairView,
+                          CastomUserViewSet, CollectViewSet, DefaultCoverView,
+                          OccasionView, OrganizationStatsView,
+                          OrganizationTotalsView, OrganizationView,
+                          PaymentConfirmationView, PaymentView, ProblemView,
                           RegionView)
 
 app_name = 'v1'
@@ -20,11 +22,27 @@ urlpatterns = (
         name='docs',
         ),
     path('payments/', PaymentView.as_view(), name='payments'),
+    path(
+        'payments/<int:pk>/confirmation/',
+        PaymentConfirmationView.as_view(),
+        name='payment-confirmation',
+        ),
     path('occansions/', OccasionView.as_view(), name='occansions'),
     path('organizations/', OrganizationView.as_view(), name='organizations'),
+    path(
+        'organizations/<slug:slug>/totals/',
+        OrganizationTotalsView.as_view(),
+        name='organization-totals',
+        ),
+    path(
+        'organizations/<slug:slug>/stats/',
+        OrganizationStatsView.as_view(),
+        name='organization-stats',
+        ),
     path('regions/', RegionView.as_view(), name='regions'),
     path('problems/', ProblemView.as_view(), name='problems'),
     path('default-covers/', DefaultCoverView.as_view(), name='default-covers'),
+    path('cache-metrics/', CacheMetricsView.as_view(), name='cache-metrics'),
     path(
         'users/', CastomUserViewSet.as_view({'post': 'create'}), name='users'
         ),
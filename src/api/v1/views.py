@@ -1,34 +1,84 @@
-from django.core.cache import cache
+from django.conf import settings as django_settings
+from django.db import transaction
 from django.db.models import QuerySet
+from django.http import HttpResponse
 from djoser.conf import settings
 from djoser.views import UserViewSet
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (OpenApiParameter, extend_schema,
+                                   extend_schema_view)
 from rest_framework import status
-from rest_framework.generics import ListAPIView, ListCreateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.generics import (GenericAPIView, ListAPIView,
+                                     ListCreateAPIView, RetrieveAPIView)
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.serializers import ModelSerializer
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from api.v1.filters import CollectFilter, OrganizationFilter
-from api.v1.paginations import CollectPagination, OrganizationPagination
+from api.v1.paginations import (CollectPagination, CollectPaymentPagination,
+                                KeysetPagination, OrganizationPagination)
 from api.v1.permissions import IsAuthenticatedOrReadOnlyAndUpdateDeleteIsOwner
-from api.v1.serializers import (CollectCreateSerializer,
+from api.v1.serializers import (CollectCreateSerializer, CollectListSerializer,
                                 CollectResponseSerializer,
                                 CollectUpdateSerializer,
                                 ConfirmationUrlSerializer,
-                                DefaultCoverSerializer, OccasionSerializer,
-                                OrganizationSerializer, PaymentSerializer,
-                                ProblemSerializer, RegionSerializer)
-from api.v1.tasks import send_mail_celery
-from collectings.models import Collect, DefaultCover, Occasion, Payment
-from organizations.models import Organization, Problem, Region
+                                DefaultCoverSerializer,
+                                DonationRollupSerializer, LiveTotalsSerializer,
+                                OccasionSerializer, OrganizationSerializer,
+                                PaymentConfirmationSerializer,
+                                PaymentIntentSerializer, PaymentSerializer,
+                                ProblemSerializer, RegionSerializer,
+                                StatsQuerySerializer)
+from api.v1.tasks import create_payment_intent_celery, send_mail_celery
+from collectings.models import (Collect, CollectRollup, DefaultCover, Occasion,
+                                Payment)
+from core.constants import FIELDS_PARAM, OMIT_PARAM, PAYMENT_INTENT_RETRY_AFTER
+from organizations.models import (Organization, OrganizationRollup, Problem,
+                                  Region)
+from utils.cache_metrics import render_metrics
 from utils.caching import CachedSetMixin, ListCachedMixin, clean_cache_by_tag
+from utils.compiled_serializers import CompiledSerializerMixin
 from utils.decorators import change_serializer_class
-from utils.payments import create_payment
+from utils.identity_map import IdentityMapMixin
+from utils.live_counters import (LiveTotalsMixin, get_live_organization_totals,
+                                 get_live_organization_totals_many,
+                                 get_live_totals, get_live_totals_many)
+from utils.payments import create_payment, set_confirmation_url
+from utils.querysets import QueryPlanMixin
+from utils.rollups import filter_rollups
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        FIELDS_PARAM,
+        OpenApiTypes.STR,
+        description=(
+            'Выводимые поля через запятую, вложенные поля через точку'
+            ),
+        ),
+    OpenApiParameter(
+        OMIT_PARAM,
+        OpenApiTypes.STR,
+        description=(
+            'Исключаемые поля через запятую, вложенные поля через точку'
+            ),
+        ),
+]
+KEYSET_CURSOR_PARAMETER = OpenApiParameter(
+    KeysetPagination.cursor_query_param,
+    OpenApiTypes.STR,
+    description=(
+        'Курсор keyset пагинации, пустой для первой страницы. '
+        'Заменяет limit/offset, общее количество не выводится'
+        ),
+    )
 
 
 @extend_schema_view(
@@ -55,6 +105,43 @@ class CastomTokenObtainPairView(TokenObtainPairView):
     """Кастомизация swagger-a."""
 
 
+class KeysetPaginationMixin(GenericAPIView):
+    """
+    Keyset пагинация по запросу.
+
+    Передача параметра cursor, в том числе пустого, заменяет
+    пагинацию limit/offset на keyset_pagination_class.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        """Отдаёт пагинатор, выбранный по параметрам запроса."""
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            cursor_param = self.keyset_pagination_class.cursor_query_param
+            if (
+                isinstance(pagination_class, type) and
+                issubclass(pagination_class, LimitOffsetPagination) and
+                cursor_param in self.request.query_params
+            ):
+                pagination_class = self.keyset_pagination_class
+            self._paginator = pagination_class and pagination_class()
+        return self._paginator
+
+
+class RollupStatsMixin:
+    """Вывод итогов пожертвований за период."""
+
+    def get_stats_response(self, rollups: QuerySet) -> Response:
+        """Отдаёт итоги за период по параметрам запроса."""
+        params = StatsQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        rollups = filter_rollups(rollups, **params.validated_data)
+        return Response(DonationRollupSerializer(rollups, many=True).data)
+
+
 @extend_schema_view(
     get=extend_schema(
         responses={200: ProblemSerializer(many=True)},
@@ -63,12 +150,14 @@ class CastomTokenObtainPairView(TokenObtainPairView):
         tags=('Некоммерческая организация',),
     ),
 )
-class ProblemView(ListCachedMixin, ListAPIView):
+class ProblemView(CompiledSerializerMixin, ListCachedMixin, ListAPIView):
     """View вывода списка решаемых проблем."""
 
     queryset = Problem.objects.all()
     serializer_class = ProblemSerializer
     tag_cache = 'problem'
+    cache_local = True
+    cache_rendered = True
 
 
 @extend_schema_view(
@@ -79,23 +168,32 @@ class ProblemView(ListCachedMixin, ListAPIView):
         tags=('Некоммерческая организация',),
     ),
 )
-class RegionView(ListCachedMixin, ListAPIView):
+class RegionView(CompiledSerializerMixin, ListCachedMixin, ListAPIView):
     """View вывода списка регионов."""
 
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     tag_cache = 'region'
+    cache_local = True
+    cache_rendered = True
 
 
 @extend_schema_view(
     get=extend_schema(
+        parameters=[*SPARSE_FIELDS_PARAMETERS, KEYSET_CURSOR_PARAMETER],
         responses={200: OrganizationSerializer(many=True)},
         summary='Список некоммерческих организаций',
         description='Выводит список некоммерческих организаций',
         tags=('Некоммерческая организация',),
     ),
 )
-class OrganizationView(ListCachedMixin, ListAPIView):
+class OrganizationView(
+    KeysetPaginationMixin,
+    CompiledSerializerMixin,
+    ListCachedMixin,
+    LiveTotalsMixin,
+    ListAPIView,
+):
     """View вывода списка некоммерческих организаций."""
 
     queryset = Organization.objects.all()
@@ -103,6 +201,67 @@ class OrganizationView(ListCachedMixin, ListAPIView):
     pagination_class = OrganizationPagination
     filterset_class = OrganizationFilter
     tag_cache = 'organization'
+    cache_single_flight = True
+    cache_early_refresh_beta = 1
+    cache_rendered = True
+    cache_dependencies = {'organization': 'pk'}
+    cache_dependency_orderings = ('count_amount',)
+    live_totals = ((None, 'pk', get_live_organization_totals_many),)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={200: LiveTotalsSerializer()},
+        summary='Текущие итоги некоммерческой организации',
+        description=(
+            'Отдаёт собранную сумму и количество жертвователей '
+            'из счётчиков Redis'
+            ),
+        tags=('Некоммерческая организация',),
+    ),
+)
+class OrganizationTotalsView(GenericAPIView):
+    """View текущих итогов некоммерческой организации."""
+
+    queryset = Organization.objects.all()
+    serializer_class = LiveTotalsSerializer
+    lookup_field = 'slug'
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт итоги по счётчикам организации."""
+        return Response(
+            self.get_serializer(
+                get_live_organization_totals(self.get_object().id)
+                ).data
+            )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        parameters=[StatsQuerySerializer],
+        responses={200: DonationRollupSerializer(many=True)},
+        summary='Итоги некоммерческой организации за период',
+        description=(
+            'Выводит сумму, количество пожертвований и жертвователей '
+            'по часам или дням'
+            ),
+        tags=('Некоммерческая организация',),
+    ),
+)
+class OrganizationStatsView(RollupStatsMixin, GenericAPIView):
+    """View итогов некоммерческой организации за период."""
+
+    queryset = Organization.objects.all()
+    serializer_class = DonationRollupSerializer
+    lookup_field = 'slug'
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт итоги организации за период."""
+        return self.get_stats_response(
+            OrganizationRollup.objects.filter(
+                organization_id=self.get_object().id,
+                )
+            )
 
 
 @extend_schema_view(
@@ -113,12 +272,14 @@ class OrganizationView(ListCachedMixin, ListAPIView):
         tags=('Групповой денежный сбор',),
     ),
 )
-class OccasionView(ListCachedMixin, ListAPIView):
+class OccasionView(CompiledSerializerMixin, ListCachedMixin, ListAPIView):
     """View вывода списка поводов сбора."""
 
     queryset = Occasion.objects.all()
     serializer_class = OccasionSerializer
     tag_cache = 'occasions'
+    cache_local = True
+    cache_rendered = True
 
 
 @extend_schema_view(
@@ -129,22 +290,26 @@ class OccasionView(ListCachedMixin, ListAPIView):
         tags=('Групповой денежный сбор',),
     ),
 )
-class DefaultCoverView(ListCachedMixin, ListAPIView):
+class DefaultCoverView(CompiledSerializerMixin, ListCachedMixin, ListAPIView):
     """View вывода списка дефолтных обложек."""
 
     queryset = DefaultCover.objects.all()
     serializer_class = DefaultCoverSerializer
     tag_cache = 'default_cover'
+    cache_local = True
+    cache_rendered = True
 
 
 @extend_schema_view(
     list=extend_schema(
-        responses={200: CollectResponseSerializer(many=True)},
+        parameters=[*SPARSE_FIELDS_PARAMETERS, KEYSET_CURSOR_PARAMETER],
+        responses={200: CollectListSerializer(many=True)},
         summary='Список групповых денежных сборов',
         description='Выводит список групповых денежных сборов',
         tags=('Групповой денежный сбор',),
     ),
     retrieve=extend_schema(
+        parameters=SPARSE_FIELDS_PARAMETERS,
         responses={200: CollectResponseSerializer()},
         summary='Получить групповой денежный сбор',
         description='Отдаёт групповой денежный сбор',
@@ -174,8 +339,41 @@ class DefaultCoverView(ListCachedMixin, ListAPIView):
         description='Делает неактивным групповой денежный сбор',
         tags=('Групповой денежный сбор',),
     ),
+    totals=extend_schema(
+        responses={200: LiveTotalsSerializer()},
+        summary='Текущие итоги группового денежного сбора',
+        description=(
+            'Отдаёт собранную сумму и количество жертвователей '
+            'из счётчиков Redis'
+            ),
+        tags=('Групповой денежный сбор',),
+    ),
+    stats=extend_schema(
+        parameters=[StatsQuerySerializer],
+        responses={200: DonationRollupSerializer(many=True)},
+        summary='Итоги группового денежного сбора за период',
+        description=(
+            'Выводит сумму, количество пожертвований и жертвователей '
+            'по часам или дням'
+            ),
+        tags=('Групповой денежный сбор',),
+    ),
+    payments=extend_schema(
+        responses={200: PaymentSerializer(many=True)},
+        summary='Список платежей для сбора',
+        description='Выводит платежи для сбора от новых к старым',
+        tags=('Групповой денежный сбор',),
+    ),
 )
-class CollectViewSet(CachedSetMixin, ModelViewSet):
+class CollectViewSet(
+    RollupStatsMixin,
+    KeysetPaginationMixin,
+    CompiledSerializerMixin,
+    IdentityMapMixin,
+    CachedSetMixin,
+    LiveTotalsMixin,
+    ModelViewSet,
+):
     """View вывода списка групповых денежных сборов."""
 
     queryset = Collect.objects.all()
@@ -187,6 +385,19 @@ class CollectViewSet(CachedSetMixin, ModelViewSet):
         )
     lookup_field = 'slug'
     tag_cache = 'collect'
+    cache_single_flight = True
+    cache_early_refresh_beta = 1
+    cache_rendered = True
+    cache_dependencies = {
+        'collect': 'pk',
+        'organization': 'organization_id',
+        }
+    cache_dependency_orderings = ('count_amount',)
+    query_plan_only = ('organization_id',)
+    live_totals = (
+        (None, 'pk', get_live_totals_many),
+        ('organization', 'organization_id', get_live_organization_totals_many),
+        )
 
     def get_serializer_class(self, *args, **kwargs) -> ModelSerializer:
         """Изменяет сериализатор в зависимости от запроса."""
@@ -196,6 +407,8 @@ class CollectViewSet(CachedSetMixin, ModelViewSet):
             serializer_class = CollectUpdateSerializer
         elif method == 'POST':
             serializer_class = CollectCreateSerializer
+        elif self.action == 'list':
+            serializer_class = CollectListSerializer
         return serializer_class
 
     @change_serializer_class(
@@ -228,10 +441,37 @@ class CollectViewSet(CachedSetMixin, ModelViewSet):
         """Делает групповой денежный сбор неактивным."""
         instance: Collect = self.get_object()
         instance.is_active = False
-        instance.save()
+        instance.save(update_fields=('is_active',))
         clean_cache_by_tag(self.tag_cache)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=('get',))
+    def totals(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт текущие итоги сбора без обращения к БД."""
+        return Response(
+            LiveTotalsSerializer(get_live_totals(self.get_object().id)).data
+            )
+
+    @action(detail=True, methods=('get',))
+    def stats(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт итоги сбора за период."""
+        return self.get_stats_response(
+            CollectRollup.objects.filter(collect_id=self.get_object().id)
+            )
+
+    @action(
+        detail=True,
+        methods=('get',),
+        serializer_class=PaymentSerializer,
+        pagination_class=CollectPaymentPagination,
+    )
+    def payments(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт страницу платежей для сбора."""
+        page = self.paginate_queryset(self.get_object().payments.all())
+        return self.get_paginated_response(
+            PaymentSerializer(page, many=True).data
+            )
+
 
 @extend_schema_view(
     get=extend_schema(
@@ -241,13 +481,21 @@ class CollectViewSet(CachedSetMixin, ModelViewSet):
         tags=('Групповой денежный сбор',),
     ),
     post=extend_schema(
-        responses={201: ConfirmationUrlSerializer},
+        responses={
+            201: ConfirmationUrlSerializer,
+            202: PaymentIntentSerializer,
+            },
         summary='Создать платёж для сбора',
-        description='Создаёт платеже для сбора',
+        description=(
+            'Создаёт платеже для сбора. При PAYMENTS_ASYNC платёж в ЮKassa '
+            'создаётся задачей, ссылка на оплату выводится по status_url'
+            ),
         tags=('Групповой денежный сбор',),
     )
 )
-class PaymentView(ListCreateAPIView):
+class PaymentView(
+    QueryPlanMixin, IdentityMapMixin, ListCachedMixin, ListCreateAPIView,
+):
     """View вывода платежей для сбора."""
 
     queryset = Payment.objects.all()
@@ -255,23 +503,33 @@ class PaymentView(ListCreateAPIView):
     permission_classes = (IsAuthenticated,)
     tag_cache = 'payment'
 
+    def get_list_cache_tags(self) -> tuple[str, ...]:
+        """Кэширует платежи каждого пользователя отдельно."""
+        return (
+            self.tag_cache, f'{self.tag_cache}_queryset_{self.request.user.id}'
+            )
+
     def get_queryset(self) -> QuerySet[Payment]:
-        """Отдаёт платежи для сбора пользователя и кэширует данные."""
-        user_id = self.request.user.id
-        queryset = cache.get(f'{self.tag_cache}_queryset_{user_id}')
-        if not queryset:
-            queryset = self.queryset.filter(user=self.request.user)
-            cache.set(f'{self.tag_cache}_queryset_{user_id}', queryset)
-        return queryset
+        """Отдаёт платежи для сбора пользователя."""
+        return super().get_queryset().filter(user=self.request.user)
 
     def perform_create(self, serializer: ModelSerializer) -> None:
         """
         Cохранение объекта в свойство.
         """
-        self.obj_save = serializer.save()
+        super().perform_create(serializer)
+        self.obj_save = serializer.instance
 
-    @change_serializer_class(serializer=ConfirmationUrlSerializer)
     def create(self, request: Request, *args, **kwargs) -> Response:
+        """Cоздаёт оплату сразу или через задачу по PAYMENTS_ASYNC."""
+        if django_settings.PAYMENTS_ASYNC:
+            return self.create_intent(request, *args, **kwargs)
+        return self.create_confirmation(request, *args, **kwargs)
+
+    @change_serializer_class(serializer=ConfirmationUrlSerializer)
+    def create_confirmation(
+            self, request: Request, *args, **kwargs,
+            ) -> Response:
         """Cоздаёт оплату и очищает кэш."""
         response = super().create(request, *args, **kwargs)
 
@@ -280,11 +538,12 @@ class PaymentView(ListCreateAPIView):
         clean_cache_by_tag(tag_cache)
 
         lookup = response.data.get('collect')
-        collect = Collect.objects.get(slug=lookup)
+        collect = self.identity_map.fetch(Collect.objects.all(), slug=lookup)
         amount = int(response.data.get('payment_amount'))
         confirmation_url = create_payment(
             collect, lookup, amount, self.obj_save.id, user_id,
             )
+        set_confirmation_url(self.obj_save.id, confirmation_url)
 
         send_mail_celery.delay(
             'Create payment',
@@ -293,3 +552,89 @@ class PaymentView(ListCreateAPIView):
         )
         response.data['confirmation_url'] = confirmation_url
         return response
+
+    def create_intent(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Записывает намерение оплаты и ставит задачу создания платежа.
+
+        Запрос не ждёт ЮKassa: ссылка на оплату выводится по status_url.
+        """
+        super().create(request, *args, **kwargs)
+        clean_cache_by_tag(f'{self.tag_cache}_queryset_{request.user.id}')
+        payment_id = self.obj_save.id
+        transaction.on_commit(
+            lambda: create_payment_intent_celery.delay(payment_id)
+            )
+        status_url = reverse(
+            'api:v1:payment-confirmation',
+            kwargs={'pk': payment_id},
+            request=request,
+            )
+        return Response(
+            PaymentIntentSerializer(
+                {'id': payment_id, 'status_url': status_url},
+                ).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url},
+            )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={
+            200: PaymentConfirmationSerializer,
+            202: PaymentConfirmationSerializer,
+            },
+        summary='Статус создания платежа',
+        description=(
+            'Выводит статус создания платежа в ЮKassa и ссылку на оплату. '
+            'Пока ссылки нет, отдаётся 202 с заголовком Retry-After'
+            ),
+        tags=('Групповой денежный сбор',),
+    ),
+)
+class PaymentConfirmationView(RetrieveAPIView):
+    """
+    View вывода ссылки на оплату записанного платежа.
+
+    Статус отдаётся сразу, без ожидания задачи: клиент повторяет
+    запрос через Retry-After.
+    """
+
+    queryset = Payment.objects.all()
+    serializer_class = PaymentConfirmationSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet[Payment]:
+        """Отдаёт платежи пользователя."""
+        return super().get_queryset().filter(user=self.request.user).only(
+            *PaymentConfirmationSerializer.Meta.fields,
+            )
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Отдаёт 202 с Retry-After, пока ссылка на оплату не получена."""
+        response = super().retrieve(request, *args, **kwargs)
+        if response.data['intent_status'] == 'created':
+            response.status_code = status.HTTP_202_ACCEPTED
+            response['Retry-After'] = str(PAYMENT_INTENT_RETRY_AFTER)
+        return response
+
+
+@extend_schema_view(
+    get=extend_schema(
+        responses={200: OpenApiTypes.STR},
+        summary='Метрики кэша',
+        description='Выводит метрики кэша в текстовом формате Prometheus',
+        tags=('Кэш',),
+    ),
+)
+class CacheMetricsView(APIView):
+    """View вывода метрик кэша."""
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> HttpResponse:
+        """Отдаёт метрики кэша."""
+        return HttpResponse(
+            render_metrics(), content_type='text/plain; version=0.0.4',
+            )
@@ -14,8 +14,6 @@ from core.admin import (BaseAdmin, CollectOrganizationBaseAdmin,
                         CollectPaymentBaseAdmin)
 from core.constants import DISPLAY_IMAGE_ADMIN
 from utils.caching import clean_cache_by_tag
-from utils.castom_fields import (get_count_amount_collect,
-                                 get_count_donaters_collect)
 
 
 @admin.register(Occasion)
@@ -97,14 +95,14 @@ class CollectAdmin(CollectOrganizationBaseAdmin, CollectPaymentBaseAdmin):
             )
     def display_count_amount(self, obj: Collect) -> SafeText:
         """Выводит собранную сумму."""
-        return get_count_amount_collect(obj)
+        return obj.collected_amount
 
     @admin.display(
             description=_('Количество пожертвований')
             )
     def display_count_donaters(self, obj: Collect) -> SafeText:
         """Выводит количество пожертвований."""
-        return get_count_donaters_collect(obj)
+        return obj.donors_count
 
 
 @admin.register(Payment)
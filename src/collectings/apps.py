@@ -6,3 +6,6 @@ class CollectingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'collectings'
     verbose_name = _('Групповые сборы')
+
+    def ready(self) -> None:
+        import collectings.signals  # noqa: F401
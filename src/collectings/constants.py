@@ -9,3 +9,8 @@ STATUSES = (
     ('succeeded', 'Успешно'),
     ('canceled', 'Отменено')
 )
+INTENT_STATUSES = (
+    ('created', 'Ожидает ссылку на оплату'),
+    ('ready', 'Ссылка на оплату получена'),
+    ('failed', 'Ошибка создания платежа'),
+)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collectings', '0003_alter_payment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='collected_amount',
+            field=models.PositiveBigIntegerField(db_comment='Собранная сумма', default=0, editable=False, help_text='Собранная сумма', verbose_name='Собранная сумма'),
+        ),
+        migrations.AddField(
+            model_name='collect',
+            name='donors_count',
+            field=models.PositiveIntegerField(db_comment='Количество жертвователей', default=0, editable=False, help_text='Количество жертвователей', verbose_name='Количество жертвователей'),
+        ),
+    ]
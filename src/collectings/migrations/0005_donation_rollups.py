@@ -0,0 +1,67 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_succeeded_datetime(apps, schema_editor):
+    """Проставляет дату успешной оплаты по дате создания платежа."""
+    Payment = apps.get_model('collectings', 'Payment')
+    Payment.objects.filter(status='succeeded').update(
+        succeeded_datetime=models.F('create_datetime'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collectings', '0004_collected_amount_donors_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Час'), ('day', 'День')], db_comment='Период', help_text='Период', max_length=4, verbose_name='Период')),
+                ('start', models.DateTimeField(db_comment='Начало периода', help_text='Начало периода', verbose_name='Начало периода')),
+                ('amount', models.PositiveBigIntegerField(db_comment='Сумма пожертвований', default=0, help_text='Сумма пожертвований', verbose_name='Сумма пожертвований')),
+                ('payments_count', models.PositiveIntegerField(db_comment='Количество пожертвований', default=0, help_text='Количество пожертвований', verbose_name='Количество пожертвований')),
+                ('donors_count', models.PositiveIntegerField(db_comment='Количество жертвователей', default=0, help_text='Количество жертвователей', verbose_name='Количество жертвователей')),
+            ],
+            options={
+                'verbose_name': 'Итоги сбора за период',
+                'verbose_name_plural': 'Итоги сборов за период',
+                'ordering': ('start',),
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='is_rolled_up',
+            field=models.BooleanField(db_comment='Учтён в итогах за период', default=False, editable=False, help_text='Учтён в итогах за период', verbose_name='Учтён в итогах за период'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='succeeded_datetime',
+            field=models.DateTimeField(blank=True, db_comment='Дата и время успешной оплаты', editable=False, help_text='Дата и время успешной оплаты', null=True, verbose_name='Дата и время успешной оплаты'),
+        ),
+        migrations.RunPython(
+            set_succeeded_datetime, migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['is_rolled_up', 'status'], name='payment_rollup_idx'),
+        ),
+        migrations.AddField(
+            model_name='collectrollup',
+            name='collect',
+            field=models.ForeignKey(db_comment='Сбор', help_text='Сбор', on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='collectings.collect', verbose_name='Сбор'),
+        ),
+        migrations.AddConstraint(
+            model_name='collectrollup',
+            constraint=models.UniqueConstraint(fields=('collect', 'period', 'start'), name='unique_collect_rollup'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collectings', '0005_donation_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['collect', '-create_datetime', '-id'], name='payment_collect_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collectings', '0006_payment_collect_latest_idx'),
+        ('organizations', '0004_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collect',
+            index=models.Index(fields=['collected_amount', 'id'], name='collect_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collect',
+            index=models.Index(fields=['create_datetime', 'id'], name='collect_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collectings', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='confirmation_url',
+            field=models.URLField(blank=True, db_comment='Ссылка на оплату', editable=False, help_text='Ссылка на оплату', max_length=2048, null=True, verbose_name='Ссылка на оплату'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='intent_status',
+            field=models.CharField(choices=[('created', 'Ожидает ссылку на оплату'), ('ready', 'Ссылка на оплату получена'), ('failed', 'Ошибка создания платежа')], db_comment='Статус создания платежа', default='created', editable=False, help_text='Статус создания платежа', max_length=7, verbose_name='Статус создания платежа'),
+        ),
+    ]
@@ -1,14 +1,17 @@
+from functools import partial
+
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_resized import ResizedImageField
 
-from collectings.constants import (MAX_PAYMENT_AMOUNT, MAX_REQUIRED_AMOUNT,
-                                   MIN_PAYMENT_AMOUNT, MIN_REQUIRED_AMOUNT,
-                                   STATUSES)
+from collectings.constants import (INTENT_STATUSES, MAX_PAYMENT_AMOUNT,
+                                   MAX_REQUIRED_AMOUNT, MIN_PAYMENT_AMOUNT,
+                                   MIN_REQUIRED_AMOUNT, STATUSES)
 from core.constants import MAX_IMAGE_SIZE
 from core.models import (BaseModel, CollectOrganizationBaseModel,
-                         CollectPaymentBaseModel)
+                         CollectPaymentBaseModel, DonationRollupBaseModel)
 from organizations.models import Organization
 from utils.models import max_len_status
 
@@ -99,6 +102,13 @@ class Collect(CollectOrganizationBaseModel, CollectPaymentBaseModel):
     class Meta(CollectOrganizationBaseModel.Meta):
         verbose_name = _('Групповой сбор')
         verbose_name_plural = _('Групповые сборы')
+        indexes = (
+            *CollectOrganizationBaseModel.Meta.indexes,
+            models.Index(
+                fields=('create_datetime', 'id'),
+                name='collect_created_idx',
+                ),
+            )
 
 
 class Payment(CollectPaymentBaseModel):
@@ -136,7 +146,105 @@ class Payment(CollectPaymentBaseModel):
         help_text=_('Статус платежа'),
         db_comment=_('Статус платежа'),
     )
+    succeeded_datetime = models.DateTimeField(
+        verbose_name=_('Дата и время успешной оплаты'),
+        help_text=_('Дата и время успешной оплаты'),
+        db_comment=_('Дата и время успешной оплаты'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    is_rolled_up = models.BooleanField(
+        verbose_name=_('Учтён в итогах за период'),
+        help_text=_('Учтён в итогах за период'),
+        db_comment=_('Учтён в итогах за период'),
+        default=False,
+        editable=False,
+    )
+    intent_status = models.CharField(
+        max_length=max_len_status(INTENT_STATUSES),
+        default=INTENT_STATUSES[0][0],
+        choices=INTENT_STATUSES,
+        verbose_name=_('Статус создания платежа'),
+        help_text=_('Статус создания платежа'),
+        db_comment=_('Статус создания платежа'),
+        editable=False,
+    )
+    confirmation_url = models.URLField(
+        max_length=2048,
+        verbose_name=_('Ссылка на оплату'),
+        help_text=_('Ссылка на оплату'),
+        db_comment=_('Ссылка на оплату'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = _('Платёж')
         verbose_name_plural = _('Платежи')
+        indexes = (
+            models.Index(
+                fields=('is_rolled_up', 'status'),
+                name='payment_rollup_idx',
+                ),
+            models.Index(
+                fields=('collect', '-create_datetime', '-id'),
+                name='payment_collect_latest_idx',
+                ),
+            )
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Сохраняет платёж и обновляет итоги сбора и организации.
+
+        Прежнее состояние читается с блокировкой строки, поэтому переход
+        в статус succeeded и из него учитывается один раз, в том числе
+        в счётчиках Redis после фиксации транзакции. Отметка учёта
+        в итогах за период берётся из БД, её меняет только rollup_donations.
+        """
+        from utils.live_counters import update_live_counters
+        from utils.totals import (PAYMENT_TOTALS_FIELDS,
+                                  get_payment_totals_state, update_totals)
+        with transaction.atomic():
+            old_state = None
+            if self.pk is not None:
+                old_state = Payment.objects.select_for_update().filter(
+                    pk=self.pk,
+                    ).values(*PAYMENT_TOTALS_FIELDS, 'is_rolled_up').first()
+            if old_state is not None:
+                self.is_rolled_up = old_state.pop('is_rolled_up')
+            if self.status == 'succeeded' and self.succeeded_datetime is None:
+                self.succeeded_datetime = timezone.now()
+            super().save(*args, **kwargs)
+            update_totals(old_state, self)
+            transaction.on_commit(
+                partial(
+                    update_live_counters,
+                    old_state,
+                    get_payment_totals_state(self),
+                    )
+                )
+
+
+class CollectRollup(DonationRollupBaseModel):
+    """Модель итогов пожертвований сбора за период."""
+
+    collect = models.ForeignKey(
+        to=Collect,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+        verbose_name=_('Сбор'),
+        help_text=_('Сбор'),
+        db_comment=_('Сбор'),
+        )
+
+    class Meta(DonationRollupBaseModel.Meta):
+        verbose_name = _('Итоги сбора за период')
+        verbose_name_plural = _('Итоги сборов за период')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('collect', 'period', 'start'),
+                name='unique_collect_rollup',
+                ),
+            )
@@ -0,0 +1,20 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from collectings.models import Payment
+from utils.live_counters import update_live_counters
+from utils.totals import change_totals, get_payment_totals_state
+
+
+@receiver(post_delete, sender=Payment)
+def subtract_deleted_payment(instance: Payment, **kwargs) -> None:
+    """Вычитает удалённый успешный платёж из итогов и счётчиков."""
+    if instance.status != 'succeeded':
+        return
+    state = get_payment_totals_state(instance)
+    with transaction.atomic():
+        change_totals(state, -1, instance.pk)
+        transaction.on_commit(partial(update_live_counters, state, None))
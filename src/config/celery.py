@@ -16,5 +16,13 @@ app.conf.beat_schedule = {
     'check_close_datetime_collect': {
         'task': 'api.v1.tasks.check_close_datetime_collect',
         'schedule': crontab(minute=0, hour=0),
-    }
+    },
+    'reconcile_live_counters': {
+        'task': 'api.v1.tasks.reconcile_live_counters_celery',
+        'schedule': 600.0,
+    },
+    'rollup_donations': {
+        'task': 'api.v1.tasks.rollup_donations_celery',
+        'schedule': 60.0,
+    },
 }
@@ -113,10 +113,46 @@ CACHES = {
         'TIMEOUT': 60 * 8,
         'OPTIONS': {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            'COMPRESSOR': 'utils.cache_compressors.ThresholdCompressor',
+            'COMPRESS_BACKEND': 'django_redis.compressors.zlib.ZlibCompressor',
+            'COMPRESS_MIN_LENGTH': 1024,
         }
     }
 }
 
+CACHE_TAG_TIMEOUTS = {
+    'occasions': 60 * 60 * 24,
+    'region': 60 * 60 * 24,
+    'problem': 60 * 60 * 24,
+    'default_cover': 60 * 60 * 24,
+    'payment': 60 * 30,
+}
+
+CACHE_WARM_HOST = os.getenv('CACHE_WARM_HOST', default='127.0.0.1:8000')
+CACHE_WARM_SECURE = os.getenv('CACHE_WARM_SECURE', default='False') == 'True'
+CACHE_WARM_ON_INVALIDATE = os.getenv(
+    'CACHE_WARM_ON_INVALIDATE', default='False',
+    ) == 'True'
+CACHE_WARM_COUNTDOWN = 5
+CACHE_WARM_TAGS = (
+    'collect',
+    'organization',
+    'occasions',
+    'region',
+    'problem',
+    'default_cover',
+)
+
+LOCAL_CACHE_MAX_SIZE = 1000
+LOCAL_CACHE_TIMEOUT = 60
+LOCAL_CACHE_VERSION_TIMEOUT = 2
+CACHE_METRICS_SINK = 'utils.cache_metrics.RedisMetricsSink'
+CACHE_METRICS_FLUSH_INTERVAL = 1
+LIVE_COUNTERS_TIMEOUT = 60 * 60 * 24
+LIVE_COUNTERS_APPROXIMATE_DONORS = os.getenv(
+    'LIVE_COUNTERS_APPROXIMATE_DONORS', default='False',
+    ) == 'True'
+
 AUTH_PASSWORD_VALIDATORS = (
     {
         'NAME': (
@@ -155,6 +191,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        os.getenv(
+            'API_JSON_RENDERER', default='api.v1.renderers.ORJSONRenderer',
+            ),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        os.getenv('API_JSON_PARSER', default='api.v1.parsers.ORJSONParser'),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -194,3 +241,6 @@ Configuration.configure(
 YOOKASA_RETURN_URL = os.getenv(
     'YOOKASA_RETURN_URL', default='http://127.0.0.1:8000/api/v1/docs/',
     )
+YOOKASSA_TIMEOUT = 10
+YOOKASSA_POOL_SIZE = 10
+PAYMENTS_ASYNC = os.getenv('PAYMENTS_ASYNC', default='False') == 'True'
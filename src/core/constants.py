@@ -1,5 +1,43 @@
+from datetime import timedelta
+
 MAX_LEN_NAME = 50
 MIN_LEN_DESCRIPTION = 5
 MAX_LEN_SLUG = 100
 DISPLAY_IMAGE_ADMIN = '<img src="{}" style="min-width:150px;max-width:150px;">'
 MAX_IMAGE_SIZE = (1500, 1500)
+TAG_VERSION_KEY = 'tag_version:{}'
+STALE_CACHE_TIMEOUT = 60 * 60
+CACHE_LOCK_TIMEOUT = 10
+CACHE_WAIT_TIMEOUT = 2
+CACHE_WAIT_INTERVAL = 0.05
+WARM_CACHE_KEY = 'warm_cache:{}'
+CACHE_METRICS_KEY = 'cache_metrics'
+CACHE_DEPENDENCY_KEY = 'cache_dependency:{}:{}'
+CACHE_DEPENDENCY_ALL = '*'
+CACHE_DEPENDENCY_GENERATION_KEY = 'cache_dependency_generation:{}'
+LIVE_TOTALS_KEY = 'live_totals:{}'
+LIVE_DONORS_KEY = 'live_donors:{}'
+LIVE_COUNTERS_CHUNK_SIZE = 1000
+LIVE_COUNTERS_RECONCILED_KEY = 'live_counters_reconciled_at'
+LIVE_DONORS_HLL_KEY = 'live_donors_hll:{}'
+LIVE_ORGANIZATION_TOTALS_KEY = 'live_organization_totals:{}'
+LIVE_ORGANIZATION_DONORS_KEY = 'live_organization_donors:{}'
+LIVE_ORGANIZATION_DONORS_HLL_KEY = 'live_organization_donors_hll:{}'
+COLLECT_LATEST_PAYMENTS = 10
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+COLLECT_PAYMENTS_PAGE_SIZE = 20
+ROLLUP_PERIODS = (
+    ('hour', 'Час'),
+    ('day', 'День'),
+)
+ROLLUP_CHUNK_SIZE = 500
+ROLLUP_LOCK_KEY = 'rollup_donations:lock'
+ROLLUP_LOCK_TIMEOUT = 60 * 5
+ROLLUP_DEFAULT_RANGES = {
+    'hour': timedelta(days=2),
+    'day': timedelta(days=90),
+}
+PAYMENT_INTENT_MAX_RETRIES = 3
+PAYMENT_INTENT_RETRY_DELAY = 5
+PAYMENT_INTENT_RETRY_AFTER = 1
@@ -0,0 +1,94 @@
+from base64 import b64encode
+from io import BytesIO
+from os import urandom
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.v1.parsers import ORJSONParser
+from api.v1.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Сравнивает время вывода страниц списка и разбора тела запроса '
+        'стандартными классами DRF и классами на orjson.'
+        )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Количество объектов на странице.',
+            )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=100,
+            help='Количество повторов вывода и разбора.',
+            )
+
+    def get_page(self, view_class: type, limit: int) -> list[dict]:
+        """Отдаёт вывод страницы списка."""
+        request = APIRequestFactory().get(
+            '/', HTTP_HOST=settings.CACHE_WARM_HOST,
+            )
+        view = view_class(
+            request=Request(request),
+            kwargs={},
+            format_kwarg=None,
+            action='list',
+            )
+        page = list(view.get_queryset()[:limit])
+        return view.get_serializer(page, many=True).data
+
+    def get_body(self) -> bytes:
+        """Отдаёт тело создания сбора с изображением в base64."""
+        image = b64encode(urandom(512 * 1024)).decode()
+        return JSONRenderer().render({
+            'name': 'Сбор',
+            'description': 'Описание сбора',
+            'cover_image': f'data:image/png;base64,{image}',
+            })
+
+    def measure(self, func, repeat: int) -> float:
+        """Отдаёт среднее время вызова в миллисекундах."""
+        start = perf_counter()
+        for _ in range(repeat):
+            func()
+        return (perf_counter() - start) / repeat * 1000
+
+    def write(self, name: str, default: float, fast: float) -> None:
+        """Выводит результат сравнения."""
+        self.stdout.write(
+            f'{name}: {default:.2f} мс -> {fast:.2f} мс, '
+            f'ускорение {default / fast:.1f}x'
+            )
+
+    def handle(self, *args, **options):
+        from api.v1.views import CollectViewSet, OrganizationView
+        limit, repeat = options['limit'], options['repeat']
+        for view_class in (CollectViewSet, OrganizationView):
+            data = {'results': self.get_page(view_class, limit)}
+            self.write(
+                f'{view_class.__name__}',
+                self.measure(lambda: JSONRenderer().render(data), repeat),
+                self.measure(lambda: ORJSONRenderer().render(data), repeat),
+                )
+        body = self.get_body()
+        self.write(
+            'Разбор тела запроса',
+            self.measure(
+                lambda: JSONParser().parse(BytesIO(body)), repeat,
+                ),
+            self.measure(
+                lambda: ORJSONParser().parse(BytesIO(body)), repeat,
+                ),
+            )
@@ -0,0 +1,82 @@
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from utils.compiled_serializers import CompiledSerializerMixin
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Сравнивает время вывода страницы списка обычным '
+        'и скомпилированным сериализатором.'
+        )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Количество объектов на странице.',
+            )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=100,
+            help='Количество повторов вывода страницы.',
+            )
+
+    def get_view(
+            self, view_class: type[CompiledSerializerMixin], compiled: bool,
+            ) -> CompiledSerializerMixin:
+        """Отдаёт view списка для запроса к корню API."""
+        request = APIRequestFactory().get(
+            '/', HTTP_HOST=settings.CACHE_WARM_HOST,
+            )
+        view = view_class(
+            request=Request(request),
+            kwargs={},
+            format_kwarg=None,
+            action='list',
+            )
+        view.use_compiled_serializer = compiled
+        return view
+
+    def measure(
+            self,
+            view_class: type[CompiledSerializerMixin],
+            compiled: bool,
+            limit: int,
+            repeat: int,
+            ) -> float:
+        """Отдаёт среднее время вывода страницы в миллисекундах."""
+        view = self.get_view(view_class, compiled)
+        start = perf_counter()
+        for _ in range(repeat):
+            page = list(view.get_queryset()[:limit])
+            view.get_serializer(page, many=True).data
+        return (perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        from api.v1.views import (CollectViewSet, DefaultCoverView,
+                                  OccasionView, OrganizationView, ProblemView,
+                                  RegionView)
+        limit, repeat = options['limit'], options['repeat']
+        for view_class in (
+            CollectViewSet,
+            OrganizationView,
+            ProblemView,
+            RegionView,
+            OccasionView,
+            DefaultCoverView,
+        ):
+            default = self.measure(view_class, False, limit, repeat)
+            compiled = self.measure(view_class, True, limit, repeat)
+            self.stdout.write(
+                f'{view_class.__name__}: {default:.2f} мс -> '
+                f'{compiled:.2f} мс, '
+                f'ускорение {default / compiled:.1f}x'
+                )
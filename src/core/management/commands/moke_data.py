@@ -9,6 +9,7 @@ from django.contrib.auth.hashers import make_password
 from django.core.files.images import ImageFile
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import F
 from django.utils.timezone import localtime
 from faker import Faker
 
@@ -19,6 +20,7 @@ from collectings.models import Collect, DefaultCover, Occasion, Payment
 from core.constants import MAX_LEN_NAME
 from organizations.models import Organization, Problem, Region
 from users.models import User as CastomUser
+from utils.totals import reconcile_totals
 
 User = get_user_model()
 
@@ -295,7 +297,11 @@ class Command(BaseCommand):
                     )
                     )
                 )
-        return Payment.objects.bulk_create(payments)
+        payments = Payment.objects.bulk_create(payments)
+        Payment.objects.filter(
+            status='succeeded', succeeded_datetime__isnull=True,
+            ).update(succeeded_datetime=F('create_datetime'))
+        return payments
 
     def handle(self, *args, **options):
         rand_bool = (True, False, False)
@@ -322,3 +328,4 @@ class Command(BaseCommand):
             users, organizations, occasions, rand_bool, fake, 3000,
             )
         self._create_payments(users, collectings, rand_bool, fake, 10000)
+        reconcile_totals(1000)
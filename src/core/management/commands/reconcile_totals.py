@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from utils.caching import clean_group_cache_by_tags
+from utils.totals import reconcile_totals
+
+
+class Command(BaseCommand):
+
+    help = 'Пересчитывает итоги сборов и организаций по платежам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество объектов, пересчитываемых за один запрос.',
+            )
+
+    def handle(self, *args, **options):
+        from api.v1.views import CollectViewSet, OrganizationView
+        collectings, organizations = reconcile_totals(options['chunk_size'])
+        if collectings or organizations:
+            clean_group_cache_by_tags(
+                (CollectViewSet.tag_cache, OrganizationView.tag_cache)
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Исправлено сборов: {collectings}, '
+                f'организаций: {organizations}.'
+                )
+            )
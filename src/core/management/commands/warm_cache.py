@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from utils.cache_warming import warm_cache
+
+
+class Command(BaseCommand):
+
+    help = 'Заполняет кэш популярных страниц.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tags',
+            nargs='*',
+            help='Корневые теги кэша, по умолчанию все.',
+            )
+        parser.add_argument(
+            '--host',
+            help='Хост для ссылок в ответах, по умолчанию CACHE_WARM_HOST.',
+            )
+        parser.add_argument(
+            '--secure',
+            action='store_true',
+            help='Строить ссылки в ответах по https.',
+            )
+
+    def handle(self, *args, **options):
+        count = warm_cache(
+            options['tags'], options['host'], options['secure'] or None,
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Заполнен кэш страниц: {count}.')
+            )
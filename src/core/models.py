@@ -6,10 +6,13 @@ from django.utils.translation import gettext_lazy as _
 from django_resized import ResizedImageField
 
 from core.constants import (MAX_IMAGE_SIZE, MAX_LEN_NAME, MAX_LEN_SLUG,
-                            MIN_LEN_DESCRIPTION)
+                            MIN_LEN_DESCRIPTION, ROLLUP_PERIODS)
+from utils.models import max_len_status
 
 User = get_user_model()
 
+TOTALS_FIELDS = ('collected_amount', 'donors_count')
+
 
 class BaseModel(models.Model):
     """Базовая модель."""
@@ -56,9 +59,49 @@ class CollectOrganizationBaseModel(BaseModel):
         db_comment=_('Описание'),
         validators=(MinLengthValidator(MIN_LEN_DESCRIPTION),),
     )
+    collected_amount = models.PositiveBigIntegerField(
+        verbose_name=_('Собранная сумма'),
+        help_text=_('Собранная сумма'),
+        db_comment=_('Собранная сумма'),
+        default=0,
+        editable=False,
+    )
+    donors_count = models.PositiveIntegerField(
+        verbose_name=_('Количество жертвователей'),
+        help_text=_('Количество жертвователей'),
+        db_comment=_('Количество жертвователей'),
+        default=0,
+        editable=False,
+    )
 
     class Meta(BaseModel.Meta):
         abstract = True
+        indexes = (
+            models.Index(
+                fields=('collected_amount', 'id'),
+                name='%(class)s_amount_idx',
+                ),
+            )
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Сохраняет объект без итогов платежей.
+
+        Итоги меняются только запросами по платежам и пересчётом,
+        поэтому устаревшие значения объекта не перезаписывают их.
+        """
+        if not (
+            self._state.adding or kwargs.get('force_insert')
+            or kwargs.get('update_fields') is not None
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = tuple(
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in TOTALS_FIELDS
+                )
+        super().save(*args, **kwargs)
 
 
 class CollectPaymentBaseModel(models.Model):
@@ -93,3 +136,42 @@ class CollectPaymentBaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class DonationRollupBaseModel(models.Model):
+    """Базовая модель итогов пожертвований за период."""
+
+    period = models.CharField(
+        max_length=max_len_status(ROLLUP_PERIODS),
+        choices=ROLLUP_PERIODS,
+        verbose_name=_('Период'),
+        help_text=_('Период'),
+        db_comment=_('Период'),
+    )
+    start = models.DateTimeField(
+        verbose_name=_('Начало периода'),
+        help_text=_('Начало периода'),
+        db_comment=_('Начало периода'),
+    )
+    amount = models.PositiveBigIntegerField(
+        verbose_name=_('Сумма пожертвований'),
+        help_text=_('Сумма пожертвований'),
+        db_comment=_('Сумма пожертвований'),
+        default=0,
+    )
+    payments_count = models.PositiveIntegerField(
+        verbose_name=_('Количество пожертвований'),
+        help_text=_('Количество пожертвований'),
+        db_comment=_('Количество пожертвований'),
+        default=0,
+    )
+    donors_count = models.PositiveIntegerField(
+        verbose_name=_('Количество жертвователей'),
+        help_text=_('Количество жертвователей'),
+        db_comment=_('Количество жертвователей'),
+        default=0,
+    )
+
+    class Meta:
+        ordering = ('start',)
+        abstract = True
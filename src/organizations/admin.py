@@ -6,7 +6,6 @@ from django.utils.translation import gettext_lazy as _
 from api.v1.views import OrganizationView, ProblemView, RegionView
 from core.admin import BaseAdmin, CollectOrganizationBaseAdmin
 from organizations.models import Organization, Problem, Region
-from utils.castom_fields import get_count_amount_organization
 
 
 @admin.register(Region)
@@ -57,4 +56,4 @@ class OrganizationAdmin(CollectOrganizationBaseAdmin):
             )
     def display_count_amount(self, obj: Organization) -> SafeText:
         """Выводит собранную сумму."""
-        return get_count_amount_organization(obj)
+        return obj.collected_amount
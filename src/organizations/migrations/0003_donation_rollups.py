@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_collected_amount_donors_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Час'), ('day', 'День')], db_comment='Период', help_text='Период', max_length=4, verbose_name='Период')),
+                ('start', models.DateTimeField(db_comment='Начало периода', help_text='Начало периода', verbose_name='Начало периода')),
+                ('amount', models.PositiveBigIntegerField(db_comment='Сумма пожертвований', default=0, help_text='Сумма пожертвований', verbose_name='Сумма пожертвований')),
+                ('payments_count', models.PositiveIntegerField(db_comment='Количество пожертвований', default=0, help_text='Количество пожертвований', verbose_name='Количество пожертвований')),
+                ('donors_count', models.PositiveIntegerField(db_comment='Количество жертвователей', default=0, help_text='Количество жертвователей', verbose_name='Количество жертвователей')),
+                ('organization', models.ForeignKey(db_comment='Некоммерческая организация', help_text='Некоммерческая организация', on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='organizations.organization', verbose_name='Некоммерческая организация')),
+            ],
+            options={
+                'verbose_name': 'Итоги организации за период',
+                'verbose_name_plural': 'Итоги организаций за период',
+                'ordering': ('start',),
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='organizationrollup',
+            constraint=models.UniqueConstraint(fields=('organization', 'period', 'start'), name='unique_organization_rollup'),
+        ),
+    ]
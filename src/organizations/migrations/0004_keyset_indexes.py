@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_donation_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['collected_amount', 'id'], name='organization_amount_idx'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from core.models import BaseModel, CollectOrganizationBaseModel
+from core.models import (BaseModel, CollectOrganizationBaseModel,
+                         DonationRollupBaseModel)
 
 
 class Region(BaseModel):
@@ -37,3 +38,26 @@ class Organization(CollectOrganizationBaseModel):
     class Meta(CollectOrganizationBaseModel.Meta):
         verbose_name = _('Некоммерческая организация')
         verbose_name_plural = _('Некоммерческие организации')
+
+
+class OrganizationRollup(DonationRollupBaseModel):
+    """Модель итогов пожертвований организации за период."""
+
+    organization = models.ForeignKey(
+        to=Organization,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+        verbose_name=_('Некоммерческая организация'),
+        help_text=_('Некоммерческая организация'),
+        db_comment=_('Некоммерческая организация'),
+        )
+
+    class Meta(DonationRollupBaseModel.Meta):
+        verbose_name = _('Итоги организации за период')
+        verbose_name_plural = _('Итоги организаций за период')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('organization', 'period', 'start'),
+                name='unique_organization_rollup',
+                ),
+            )
@@ -0,0 +1,29 @@
+from django.utils.module_loading import import_string
+from django_redis.compressors.base import BaseCompressor
+
+
+class ThresholdCompressor(BaseCompressor):
+    """
+    Сжатие значений кэша размером больше COMPRESS_MIN_LENGTH байт.
+
+    Алгоритм задаётся в COMPRESS_BACKEND компрессором django-redis,
+    например zlib или lz4, меньшие значения хранятся без сжатия.
+    """
+
+    def __init__(self, options: dict) -> None:
+        super().__init__(options)
+        self._compressor = import_string(
+            options.get(
+                'COMPRESS_BACKEND',
+                'django_redis.compressors.zlib.ZlibCompressor',
+                )
+            )(options)
+        self._compressor.min_length = options.get('COMPRESS_MIN_LENGTH', 1024)
+
+    def compress(self, value: bytes) -> bytes:
+        """Сжимает значение."""
+        return self._compressor.compress(value)
+
+    def decompress(self, value: bytes) -> bytes:
+        """Распаковывает значение."""
+        return self._compressor.decompress(value)
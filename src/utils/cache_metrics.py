@@ -0,0 +1,167 @@
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cache
+from threading import Lock
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.utils.module_loading import import_string
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from core.constants import CACHE_METRICS_KEY
+
+logger = logging.getLogger(__name__)
+
+METRICS = {
+    'hits': 'Попадания в кэш Redis.',
+    'misses': 'Промахи кэша Redis.',
+    'local_hits': 'Попадания в кэш процесса.',
+    'sets': 'Записи в кэш Redis.',
+    'invalidations': 'Очистки кэша по тегу.',
+    'keys_removed': 'Удалённые ключи кэша Redis.',
+    'redis_seconds': 'Время обращений к Redis в секундах.',
+}
+TAG_SUFFIX = re.compile(r'_(queryset|object|retrieve)(_.*)?$|_\d+$')
+
+
+def get_root_tag(key: str) -> str:
+    """
+    Отдаёт корневой тег по ключу или тегу кэша.
+
+    Идентификаторы объектов и параметры отбрасываются, чтобы число
+    тегов метрик не росло вместе с числом ключей.
+    """
+    return TAG_SUFFIX.sub('', key.split(':')[0])
+
+
+class MemoryMetricsSink:
+    """
+    Хранение метрик кэша в памяти процесса.
+
+    Каждый процесс ведёт свои счётчики, поэтому при нескольких
+    процессах вывод показывает только процесс, ответивший на запрос.
+    """
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[tuple[str, str], float] = defaultdict(
+            float
+            )
+        self._lock = Lock()
+
+    def incr(self, metric: str, tag: str, value: float = 1) -> None:
+        """Увеличивает счётчик метрики тега."""
+        with self._lock:
+            self._counters[(metric, tag)] += value
+
+    def collect(self) -> dict[tuple[str, str], float]:
+        """Отдаёт значения счётчиков."""
+        with self._lock:
+            return dict(self._counters)
+
+
+class LoggingMetricsSink(MemoryMetricsSink):
+    """Хранение метрик кэша в памяти процесса с записью в лог."""
+
+    def incr(self, metric: str, tag: str, value: float = 1) -> None:
+        """Увеличивает счётчик метрики тега и пишет событие в лог."""
+        super().incr(metric, tag, value)
+        logger.debug('cache %s tag=%s value=%s', metric, tag, value)
+
+
+class RedisMetricsSink(MemoryMetricsSink):
+    """
+    Хранение метрик кэша в Redis, общее для всех процессов.
+
+    Счётчики копятся в памяти процесса и переносятся в хэш Redis
+    не чаще раза в CACHE_METRICS_FLUSH_INTERVAL секунд, поэтому
+    обращения к кэшу не ждут отдельного запроса на каждое событие.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._flushed_at = monotonic()
+
+    def incr(self, metric: str, tag: str, value: float = 1) -> None:
+        """Увеличивает счётчик метрики тега."""
+        super().incr(metric, tag, value)
+        if monotonic() - self._flushed_at >= (
+            settings.CACHE_METRICS_FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Переносит накопленные счётчики в Redis.
+
+        При недоступности Redis счётчики возвращаются в память процесса
+        и переносятся при следующей попытке.
+        """
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(float)
+            self._flushed_at = monotonic()
+        if not counters:
+            return
+        try:
+            pipeline = get_redis_connection().pipeline(transaction=False)
+            for (metric, tag), value in counters.items():
+                pipeline.hincrbyfloat(
+                    django_cache.make_key(CACHE_METRICS_KEY),
+                    f'{metric}:{tag}',
+                    value,
+                    )
+            pipeline.execute()
+        except RedisError:
+            logger.warning('cache metrics flush failed', exc_info=True)
+            for (metric, tag), value in counters.items():
+                super().incr(metric, tag, value)
+
+    def collect(self) -> dict[tuple[str, str], float]:
+        """Отдаёт значения счётчиков всех процессов."""
+        self.flush()
+        counters = get_redis_connection().hgetall(
+            django_cache.make_key(CACHE_METRICS_KEY),
+            )
+        return {
+            tuple(field.decode().split(':', 1)): float(value)
+            for field, value in counters.items()
+            }
+
+
+@cache
+def get_metrics_sink() -> MemoryMetricsSink:
+    """Отдаёт хранилище метрик из настройки CACHE_METRICS_SINK."""
+    return import_string(settings.CACHE_METRICS_SINK)()
+
+
+def record(metric: str, key: str, value: float = 1) -> None:
+    """Учитывает событие кэша."""
+    get_metrics_sink().incr(metric, get_root_tag(key), value)
+
+
+@contextmanager
+def redis_timer(key: str) -> Iterator[None]:
+    """Учитывает время обращения к Redis."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record('redis_seconds', key, perf_counter() - start)
+
+
+def render_metrics() -> str:
+    """Отдаёт метрики в текстовом формате Prometheus."""
+    counters = get_metrics_sink().collect()
+    lines = []
+    for metric, description in METRICS.items():
+        name = f'cache_{metric}_total'
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} counter')
+        for (counter_metric, tag), value in sorted(counters.items()):
+            if counter_metric == metric:
+                lines.append(f'{name}{{tag="{tag}"}} {value}')
+    return '\n'.join(lines) + '\n'
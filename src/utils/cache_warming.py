@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory
+
+from core.constants import WARM_CACHE_KEY
+from utils.cache_metrics import get_root_tag
+
+
+def get_warm_urls() -> dict[str, list[tuple[str, dict[str, str]]]]:
+    """
+    Отдаёт популярные страницы по корневым тегам кэша.
+
+    Страница по умолчанию, страницы поводов, регионов и сортировки
+    по сумме пожертвований, а также справочники.
+    """
+    from api.v1.views import (CollectViewSet, DefaultCoverView, OccasionView,
+                              OrganizationView, ProblemView, RegionView)
+    from collectings.models import Occasion
+    from organizations.models import Region
+
+    occasions = Occasion.objects.values_list('slug', flat=True)
+    regions = Region.objects.values_list('slug', flat=True)
+    orderings = ({'order_by': 'count_amount'}, {'order_by': '-count_amount'})
+    collect_url = reverse('api:v1:collect-list')
+    organization_url = reverse('api:v1:organizations')
+    return {
+        CollectViewSet.tag_cache: [
+            (collect_url, params) for params in (
+                {},
+                *orderings,
+                *({'occasion': occasion} for occasion in occasions),
+                *({'region': region} for region in regions),
+            )
+        ],
+        OrganizationView.tag_cache: [
+            (organization_url, params) for params in (
+                {},
+                *orderings,
+                *({'regions': region} for region in regions),
+            )
+        ],
+        OccasionView.tag_cache: [(reverse('api:v1:occansions'), {})],
+        RegionView.tag_cache: [(reverse('api:v1:regions'), {})],
+        ProblemView.tag_cache: [(reverse('api:v1:problems'), {})],
+        DefaultCoverView.tag_cache: [(reverse('api:v1:default-covers'), {})],
+    }
+
+
+def warm_cache(
+        tags_cache: Iterable[str] | None = None,
+        host: str | None = None,
+        secure: bool | None = None,
+        ) -> int:
+    """
+    Заполняет кэш популярных страниц запросами к view.
+
+    Ссылки в ответах строятся от host, поэтому он должен совпадать
+    с адресом, по которому API доступно клиентам.
+    """
+    host = host or settings.CACHE_WARM_HOST
+    secure = settings.CACHE_WARM_SECURE if secure is None else secure
+    warm_urls = get_warm_urls()
+    if tags_cache is not None:
+        warm_urls = {
+            tag_cache: warm_urls[tag_cache]
+            for tag_cache in tags_cache if tag_cache in warm_urls
+        }
+    factory = APIRequestFactory()
+    count = 0
+    for urls in warm_urls.values():
+        for url, params in urls:
+            request = factory.get(
+                url, params, HTTP_HOST=host, secure=secure,
+                )
+            resolve(url).func(request)
+            count += 1
+    return count
+
+
+def warm_cache_on_invalidate(tag_cache: str) -> None:
+    """
+    Ставит задачу повторного заполнения кэша после очистки тега.
+
+    Задачи одного тега объединяются на CACHE_WARM_COUNTDOWN секунд,
+    поэтому серия очисток заполняет кэш один раз.
+    """
+    root_tag = get_root_tag(tag_cache)
+    if (
+        not settings.CACHE_WARM_ON_INVALIDATE or
+        tag_cache not in (root_tag, f'{root_tag}_queryset') or
+        root_tag not in settings.CACHE_WARM_TAGS
+    ):
+        return
+    countdown = settings.CACHE_WARM_COUNTDOWN
+    if not cache.add(WARM_CACHE_KEY.format(root_tag), 1, countdown):
+        return
+    from config.celery import app
+    app.send_task(
+        'api.v1.tasks.warm_cache_celery',
+        args=(root_tag,),
+        countdown=countdown,
+        )
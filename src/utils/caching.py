@@ -1,20 +1,372 @@
-from collections.abc import Iterable
-
+import json
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from hashlib import md5
+from math import inf, log
+from random import random
+from time import sleep, time
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from django.conf import settings
 from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Model, QuerySet
+from django.http import HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django_filters import MultipleChoiceFilter
+from django_redis import get_redis_connection
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin, RetrieveModelMixin,
                                    UpdateModelMixin)
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
 
+from core.constants import (CACHE_DEPENDENCY_ALL,
+                            CACHE_DEPENDENCY_GENERATION_KEY,
+                            CACHE_DEPENDENCY_KEY, CACHE_LOCK_TIMEOUT,
+                            CACHE_WAIT_INTERVAL, CACHE_WAIT_TIMEOUT,
+                            FIELDS_PARAM, OMIT_PARAM, STALE_CACHE_TIMEOUT,
+                            TAG_VERSION_KEY)
+from utils.cache_metrics import get_root_tag, record, redis_timer
+from utils.cache_warming import warm_cache_on_invalidate
+from utils.local_cache import LocalCache
+
+local_cache = LocalCache(
+    settings.LOCAL_CACHE_MAX_SIZE, settings.LOCAL_CACHE_TIMEOUT,
+    )
+
+
+class EmptyValue:
+    """
+    Метка сохранённого в кэше None.
+
+    Redis-клиент не отличает сохранённый None от отсутствия ключа,
+    поэтому None хранится как эта метка, переживающая pickle.
+    """
+
+    def __reduce__(self) -> str:
+        return 'EMPTY'
+
+    def __repr__(self) -> str:
+        return 'EMPTY'
+
+
+EMPTY = EmptyValue()
+MISSING = object()
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Запись кэша с длительностью вычисления и временем истечения."""
+
+    value: Any
+    delta: float
+    expire_at: float
+
+
+def get_cache_timeout(key: str) -> int | None:
+    """Отдаёт время жизни ключа по корневому тегу из CACHE_TAG_TIMEOUTS."""
+    return settings.CACHE_TAG_TIMEOUTS.get(
+        get_root_tag(key), cache.default_timeout,
+        )
+
+
+def cache_get(key: str, default: Any = None) -> Any:
+    """
+    Читает значение из Redis с учётом метрик.
+
+    Сохранённый None отдаётся как None, отсутствие ключа как default,
+    для их различения передаётся default=MISSING.
+    """
+    with redis_timer(key):
+        value = cache.get(key, MISSING)
+    if value is MISSING:
+        record('misses', key)
+        return default
+    record('hits', key)
+    return None if value is EMPTY else value
+
+
+def cache_set(key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+    """Записывает значение в Redis с учётом метрик, None сохраняется."""
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = get_cache_timeout(key)
+    with redis_timer(key):
+        cache.set(key, EMPTY if value is None else value, timeout)
+    record('sets', key)
+
+
+def cache_get_many(keys: Sequence[str]) -> dict[str, Any]:
+    """
+    Читает значения из Redis одним запросом с учётом метрик.
+
+    Отсутствующих ключей нет в результате, сохранённый None отдаётся.
+    """
+    if not keys:
+        return {}
+    with redis_timer(keys[0]):
+        values = cache.get_many(keys)
+    for key in keys:
+        record('hits' if key in values else 'misses', key)
+    return {
+        key: None if value is EMPTY else value
+        for key, value in values.items()
+        }
+
+
+def cache_set_many(
+        data: dict[str, Any], timeout: Any = DEFAULT_TIMEOUT,
+        ) -> None:
+    """Записывает значения в Redis одним запросом с учётом метрик."""
+    if not data:
+        return
+    key = next(iter(data))
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = get_cache_timeout(key)
+    data = {
+        key: EMPTY if value is None else value for key, value in data.items()
+        }
+    with redis_timer(key):
+        cache.set_many(data, timeout)
+    for key in data:
+        record('sets', key)
+
+
+def get_tags_version(tags: Sequence[str], local: bool = False) -> str:
+    """
+    Отдаёт версии тегов одним запросом.
+
+    local: версии берутся из кэша процесса, который сверяется с Redis
+    не чаще LOCAL_CACHE_VERSION_TIMEOUT.
+    """
+    keys = [TAG_VERSION_KEY.format(tag) for tag in tags]
+    versions = {}
+    if local:
+        for key in keys:
+            version = local_cache.get(key)
+            if version is not None:
+                versions[key] = version
+    missing_keys = [key for key in keys if key not in versions]
+    if missing_keys:
+        with redis_timer(tags[0]):
+            missing_versions = cache.get_many(missing_keys)
+        for key in missing_keys:
+            versions[key] = missing_versions.get(key, 0)
+            if local:
+                local_cache.set(
+                    key,
+                    versions[key],
+                    settings.LOCAL_CACHE_VERSION_TIMEOUT,
+                    )
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def get_cache_key(*tags: str, params: str = '', local: bool = False) -> str:
+    """
+    Формирует ключ кэша.
+
+    Теги передаются от общего к частному, в ключ встраиваются их версии,
+    поэтому очистка любого из тегов делает ключ недоступным.
+    """
+    return f'{tags[-1]}{params}:{get_tags_version(tags, local)}'
+
+
+def get_cache_keys(tags: Sequence[str]) -> list[str]:
+    """
+    Формирует ключи кэша независимых тегов.
+
+    Версии всех тегов читаются одним запросом.
+    """
+    if not tags:
+        return []
+    version_keys = [TAG_VERSION_KEY.format(tag) for tag in tags]
+    with redis_timer(tags[0]):
+        versions = cache.get_many(version_keys)
+    return [
+        f'{tag}:{versions.get(version_key, 0)}'
+        for tag, version_key in zip(tags, version_keys)
+        ]
+
+
+def get_stale_cache_key(*tags: str, params: str = '') -> str:
+    """Формирует ключ устаревшей копии кэша, не зависящий от версий."""
+    return f'{tags[-1]}{params}:stale'
+
 
 def clean_cache_by_tag(tag_cache: str) -> None:
-    """Очищает кэш по тегу."""
-    keys = cache.keys(f'{tag_cache}*')
-    cache.delete_many(keys)
+    """
+    Очищает кэш по тегу.
+
+    Увеличивает версию тега, старые ключи удаляются по истечению TIMEOUT.
+    При CACHE_WARM_ON_INVALIDATE страницы тега заполняются заново.
+    """
+    key = TAG_VERSION_KEY.format(tag_cache)
+    local_cache.delete(key)
+    record('invalidations', tag_cache)
+    with redis_timer(tag_cache):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+    warm_cache_on_invalidate(tag_cache)
+
+
+def _is_early_expired(entry: CacheEntry, beta: float) -> bool:
+    """
+    Вероятностное раннее истечение записи.
+
+    Чем дольше вычисление и ближе время истечения, тем выше вероятность
+    того, что запрос обновит запись заранее.
+    """
+    if not beta:
+        return False
+    return time() - entry.delta * beta * log(1 - random()) >= entry.expire_at
+
+
+def _get_cache_entry(key: str, local: bool) -> CacheEntry | None:
+    """Отдаёт запись из кэша процесса или Redis."""
+    if local and isinstance(entry := local_cache.get(key), CacheEntry):
+        record('local_hits', key)
+        return entry
+    entry = cache_get(key)
+    if not isinstance(entry, CacheEntry):
+        return None
+    if local:
+        local_cache.set(key, entry)
+    return entry
+
+
+def _compute_cache(
+        key: str,
+        compute: Callable[[], Any],
+        timeout: int | None,
+        stale_key: str | None,
+        local: bool,
+        ) -> Any:
+    """Вычисляет значение и сохраняет его в кэш."""
+    start = time()
+    value = compute()
+    now = time()
+    entry = CacheEntry(
+        value, now - start, now + timeout if timeout is not None else inf,
+        )
+    cache_set(key, entry, timeout)
+    if stale_key:
+        cache_set(stale_key, entry, STALE_CACHE_TIMEOUT)
+    if local:
+        local_cache.set(key, entry)
+    return value
+
+
+def acquire_cache_lock(
+        lock_key: str, timeout: int = CACHE_LOCK_TIMEOUT,
+        ) -> str | None:
+    """Захватывает блокировку и отдаёт её метку или None, если она занята."""
+    token = uuid4().hex
+    with redis_timer(lock_key):
+        if cache.add(lock_key, token, timeout):
+            return token
+    return None
+
+
+def extend_cache_lock(lock_key: str, token: str, timeout: int) -> bool:
+    """
+    Продлевает блокировку, если она всё ещё хранит метку.
+
+    Отдаёт False, если блокировка истекла и, возможно, захвачена
+    другим обработчиком.
+    """
+    with redis_timer(lock_key):
+        return bool(
+            get_redis_connection().eval(
+                EXTEND_LOCK_SCRIPT,
+                1,
+                cache.make_key(lock_key),
+                cache.client.encode(token),
+                timeout,
+                )
+            )
+
+
+def release_cache_lock(lock_key: str, token: str) -> None:
+    """
+    Снимает блокировку, если она всё ещё хранит метку.
+
+    Блокировка, истёкшая за время вычисления и захваченная другим
+    запросом, не удаляется.
+    """
+    with redis_timer(lock_key):
+        get_redis_connection().eval(
+            RELEASE_LOCK_SCRIPT,
+            1,
+            cache.make_key(lock_key),
+            cache.client.encode(token),
+            )
+
+
+def get_or_set_cache(
+        key: str,
+        compute: Callable[[], Any],
+        timeout: int | None = None,
+        stale_key: str | None = None,
+        single_flight: bool = False,
+        early_refresh_beta: float = 0,
+        local: bool = False,
+        ) -> Any:
+    """
+    Отдаёт значение из кэша или вычисляет его.
+
+    single_flight: значение вычисляет только получивший блокировку запрос,
+    остальные отдают устаревшую копию или ждут CACHE_WAIT_TIMEOUT.
+    early_refresh_beta: коэффициент раннего обновления записи, 0 отключает.
+    local: перед Redis используется кэш процесса.
+    По умолчанию время жизни берётся из CACHE_TAG_TIMEOUTS.
+    """
+    if timeout is None:
+        timeout = get_cache_timeout(key)
+    entry = _get_cache_entry(key, local)
+    if (
+        entry is not None and
+        not _is_early_expired(entry, early_refresh_beta)
+    ):
+        return entry.value
+    if not single_flight:
+        return _compute_cache(key, compute, timeout, stale_key, local)
+    lock_key = f'{key}:lock'
+    token = acquire_cache_lock(lock_key)
+    if token is not None:
+        try:
+            return _compute_cache(key, compute, timeout, stale_key, local)
+        finally:
+            release_cache_lock(lock_key, token)
+    if entry is not None:
+        return entry.value
+    if stale_key and isinstance(stale := cache_get(stale_key), CacheEntry):
+        return stale.value
+    deadline = time() + CACHE_WAIT_TIMEOUT
+    while time() < deadline:
+        sleep(CACHE_WAIT_INTERVAL)
+        entry = _get_cache_entry(key, local)
+        if entry is not None:
+            return entry.value
+    return _compute_cache(key, compute, timeout, stale_key, local)
 
 
 def clean_group_cache_by_tags(tags_cache: Iterable[str]) -> None:
@@ -23,32 +375,463 @@ def clean_group_cache_by_tags(tags_cache: Iterable[str]) -> None:
         clean_cache_by_tag(tag_cache)
 
 
-class QuerysetCachedMixin(GenericAPIView):
-    """Кэширование queryset."""
+def get_dependency_key(tag: str, obj_id: Any) -> str:
+    """Формирует ключ Redis множества ключей кэша, зависящих от объекта."""
+    return cache.make_key(CACHE_DEPENDENCY_KEY.format(tag, obj_id))
+
+
+def add_cache_dependencies(
+        key: str, dependencies: dict[str, Iterable[Any]],
+        ) -> None:
+    """
+    Записывает ключ кэша в обратный индекс объектов, от которых он зависит.
+
+    Индекс живёт не дольше ключа и обновляется при каждой его записи.
+    """
+    if not dependencies:
+        return
+    timeout = get_cache_timeout(key)
+    with redis_timer(key):
+        pipeline = get_redis_connection().pipeline(transaction=False)
+        for tag, ids in dependencies.items():
+            for obj_id in ids:
+                dependency_key = get_dependency_key(tag, obj_id)
+                pipeline.sadd(dependency_key, key)
+                if timeout is not None:
+                    pipeline.expire(dependency_key, timeout)
+        pipeline.execute()
+
+
+def get_dependency_generations(tags: Sequence[str]) -> list[Any]:
+    """Отдаёт номера очисток кэша по зависимостям тегов."""
+    with redis_timer(tags[0]):
+        return get_redis_connection().mget([
+            cache.make_key(CACHE_DEPENDENCY_GENERATION_KEY.format(tag))
+            for tag in tags
+            ])
+
+
+def get_or_set_dependent_cache(
+        key: str,
+        compute: Callable[[], Any],
+        tags: Sequence[str],
+        get_dependencies: Callable[[], dict[str, Iterable[Any]]],
+        **kwargs,
+        ) -> Any:
+    """
+    Отдаёт значение из кэша или вычисляет его с записью зависимостей.
+
+    Номера очисток тегов запоминаются до вычисления. Если за время
+    вычисления кэш тегов очищался по зависимостям, записанное значение
+    удаляется: оно могло быть посчитано по данным до изменения.
+    """
+    if not tags:
+        return get_or_set_cache(key, compute, **kwargs)
+    generations = []
+
+    def compute_dependent() -> Any:
+        generations.append(get_dependency_generations(tags))
+        value = compute()
+        add_cache_dependencies(key, get_dependencies())
+        return value
+
+    value = get_or_set_cache(key, compute_dependent, **kwargs)
+    if generations and get_dependency_generations(tags) != generations[0]:
+        with redis_timer(key):
+            removed = cache.delete_many((key, f'{key}:meta'))
+        if removed:
+            record('keys_removed', key, removed)
+    return value
+
+
+def clean_cache_by_dependencies(
+        dependencies: dict[str, Iterable[Any]],
+        ) -> None:
+    """
+    Очищает кэш, зависящий от объектов.
+
+    Удаляются только ключи из обратного индекса объектов и ключи,
+    зависящие от всех объектов тега, остальной кэш тега сохраняется.
+    Ключи удаляются только в Redis, поэтому кэш процесса с зависимостями
+    не используется. Номер очистки тега увеличивается, чтобы значения,
+    вычисляемые в это время, не сохранились в кэше.
+    """
+    dependency_keys = [
+        get_dependency_key(tag, obj_id)
+        for tag, ids in dependencies.items()
+        for obj_id in (*ids, CACHE_DEPENDENCY_ALL)
+        ]
+    if not dependency_keys:
+        return
+    with redis_timer(next(iter(dependencies))):
+        connection = get_redis_connection()
+        pipeline = connection.pipeline()
+        for dependency_key in dependency_keys:
+            pipeline.smembers(dependency_key)
+        pipeline.delete(*dependency_keys)
+        for tag in dependencies:
+            pipeline.incr(
+                cache.make_key(CACHE_DEPENDENCY_GENERATION_KEY.format(tag))
+                )
+        members = pipeline.execute()[:len(dependency_keys)]
+        keys = sorted({key.decode() for keys in members for key in keys})
+        pipeline = connection.pipeline(transaction=False)
+        for key in keys:
+            pipeline.delete(cache.make_key(key), cache.make_key(f'{key}:meta'))
+        removed = pipeline.execute() if keys else []
+    for key, count in zip(keys, removed):
+        if count:
+            record('keys_removed', key, count)
+    for tag in dependencies:
+        record('invalidations', tag)
+        warm_cache_on_invalidate(tag)
+
+
+def get_filter_cache_params(view: GenericAPIView) -> dict[str, Any]:
+    """
+    Отдаёт нормализованные параметры запроса, используемые фильтрами.
+
+    Пустые и посторонние параметры отбрасываются, значения фильтров
+    со множественным выбором сортируются.
+    """
+    query_params = view.request.query_params
+    filters = {}
+    for backend_class in view.filter_backends:
+        backend = backend_class()
+        if hasattr(backend, 'get_filterset_class'):
+            filterset_class = backend.get_filterset_class(
+                view, view.get_queryset(),
+                )
+            if filterset_class is not None:
+                filters.update(filterset_class.base_filters)
+            continue
+        for attr in ('search_param', 'ordering_param'):
+            if hasattr(backend, attr):
+                filters[getattr(backend, attr)] = None
+    params = {}
+    for name, filter_ in filters.items():
+        values = [value for value in query_params.getlist(name) if value]
+        if not values:
+            continue
+        if isinstance(filter_, MultipleChoiceFilter):
+            params[name] = sorted(set(values))
+        else:
+            params[name] = values[-1]
+    return params
+
+
+def get_pagination_cache_params(view: GenericAPIView) -> dict[str, Any]:
+    """Отдаёт параметры пагинации с подставленными значениями по умолчанию."""
+    paginator = view.paginator
+    if paginator is None:
+        return {}
+    request = view.request
+    if isinstance(paginator, LimitOffsetPagination):
+        return {
+            paginator.limit_query_param: paginator.get_limit(request),
+            paginator.offset_query_param: paginator.get_offset(request),
+            }
+    params = {}
+    for attr in (
+        'page_query_param', 'page_size_query_param', 'cursor_query_param',
+    ):
+        param = getattr(paginator, attr, None)
+        if param and param in request.query_params:
+            params[param] = request.query_params[param]
+    return params
+
+
+def get_fields_cache_params(view: GenericAPIView) -> dict[str, Any]:
+    """Отдаёт нормализованный выбор выводимых полей."""
+    params = {}
+    for param in (FIELDS_PARAM, OMIT_PARAM):
+        names = {
+            name.strip()
+            for value in view.request.query_params.getlist(param)
+            for name in value.split(',')
+            }
+        names.discard('')
+        if names:
+            params[param] = sorted(names)
+    return params
+
+
+def hash_cache_params(params: dict[str, Any]) -> str:
+    """Отдаёт хэш параметров для ключа кэша."""
+    return md5(
+        json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+
+class CachedPkList:
+    """
+    Список первичных ключей, загружающий объекты только для среза.
+
+    Строки queryset после values() должны содержать pk.
+    """
+
+    def __init__(self, queryset: QuerySet[Model], pks: list) -> None:
+        self.queryset = queryset
+        self.pks = pks
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def __getitem__(self, index: int | slice) -> list[Model] | Model:
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        pks = self.pks[index]
+        if self.queryset.query.values_select:
+            objs = {
+                row['pk']: row for row in self.queryset.filter(pk__in=pks)
+                }
+        else:
+            objs = self.queryset.in_bulk(pks)
+        return [objs[pk] for pk in pks if pk in objs]
+
+    def __iter__(self) -> Iterator[Model]:
+        return iter(self[:])
+
+
+class DataCachedMixin:
+    """
+    Настройки кэширования вывода.
+
+    cache_single_flight: пересчёт выполняет один запрос.
+    cache_early_refresh_beta: коэффициент раннего обновления, 0 отключает.
+    cache_local: перед Redis используется кэш процесса.
+    cache_rendered: для JSON кэшируется готовое тело ответа, которое
+    отдаётся без сериализатора и рендера.
+    cache_dependencies: теги зависимостей и атрибуты выводимых объектов
+    с их идентификаторами, кэш удаляется только при изменении этих объектов.
+    cache_dependency_orderings: поля сортировки, значения которых зависят
+    от объектов зависимостей, такой кэш зависит от всех объектов тега.
+    """
+
+    cache_single_flight = False
+    cache_early_refresh_beta = 0
+    cache_local = False
+    cache_rendered = False
+    cache_dependencies: dict[str, str] = {}
+    cache_dependency_orderings: tuple[str, ...] = ()
+    cache_ordering_param = 'order_by'
+    cache_objects: Sequence[Model] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Запрещает кэш процесса вместе с зависимостями.
+
+        Удаление ключей по зависимостям не доходит до кэша процесса
+        в других процессах, и они отдавали бы устаревшие данные.
+        """
+        super().__init_subclass__(**kwargs)
+        if cls.cache_local and cls.cache_dependencies:
+            raise ImproperlyConfigured(
+                f'{cls.__name__}: cache_local нельзя использовать '
+                'вместе с cache_dependencies.'
+                )
+
+    def is_cache_ordering_dependent(self) -> bool:
+        """Проверяет сортировку по полям, зависящим от других объектов."""
+        ordering = ','.join(
+            self.request.query_params.getlist(self.cache_ordering_param)
+            )
+        return any(
+            field.strip().lstrip('-') in self.cache_dependency_orderings
+            for field in ordering.split(',')
+            )
 
-    def get_queryset(self) -> QuerySet[Model]:
-        """Кэширование списка данных."""
-        key = f'{self.tag_cache}_queryset'
-        queryset = cache.get(key)
-        if not queryset:
-            queryset = super().get_queryset()
-            cache.set(key, queryset)
-        return queryset
+    def get_cache_dependencies(self) -> dict[str, set[Any]]:
+        """Отдаёт идентификаторы объектов, от которых зависит вывод."""
+        if self.is_cache_ordering_dependent():
+            return {
+                tag: {CACHE_DEPENDENCY_ALL} for tag in self.cache_dependencies
+                }
+        dependencies = defaultdict(set)
+        for obj in self.cache_objects:
+            for tag, attr in self.cache_dependencies.items():
+                dependencies[tag].add(
+                    obj[attr] if isinstance(obj, dict) else getattr(obj, attr)
+                    )
+        return dependencies
+
+    def get_cached_data(
+            self,
+            tags: Sequence[str],
+            params: str,
+            compute: Callable[[], Any],
+            key: str | None = None,
+            ) -> Any:
+        """Отдаёт данные из кэша или вычисляет их."""
+        if key is None:
+            key = get_cache_key(*tags, params=params, local=self.cache_local)
+        stale_key = None
+        if self.cache_single_flight:
+            stale_key = get_stale_cache_key(*tags, params=params)
+        return get_or_set_dependent_cache(
+            key,
+            compute,
+            tuple(self.cache_dependencies),
+            self.get_cache_dependencies,
+            stale_key=stale_key,
+            single_flight=self.cache_single_flight,
+            early_refresh_beta=self.cache_early_refresh_beta,
+            local=self.cache_local,
+            )
+
+    def prepare_cached_response(self, response: Response) -> Response:
+        """Дополняет ответ перед записью в кэш."""
+        return response
+
+    def render_response(
+            self, response: Response, meta_key: str,
+            ) -> tuple[bytes, str, str, int]:
+        """
+        Отдаёт тело ответа, его тип, ETag и время изменения.
+
+        ETag и время изменения дополнительно сохраняются отдельно,
+        чтобы отвечать на условные запросы без чтения тела ответа.
+        """
+        response.accepted_renderer = self.request.accepted_renderer
+        response.accepted_media_type = self.request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        content = response.rendered_content
+        etag = quote_etag(md5(content).hexdigest())
+        last_modified = int(time())
+        cache_set(meta_key, (etag, last_modified))
+        return content, response['Content-Type'], etag, last_modified
+
+    @staticmethod
+    def set_validators(
+            response: HttpResponseBase, etag: str, last_modified: int,
+            ) -> HttpResponseBase:
+        """Добавляет заголовки ETag и Last-Modified."""
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_cached_response(
+            self,
+            tags: Sequence[str],
+            params: str,
+            compute: Callable[[], Response],
+            ) -> HttpResponseBase:
+        """
+        Отдаёт ответ из кэша данных или готового тела ответа.
+
+        Для готового тела ответа поддерживаются условные запросы,
+        при совпадении ETag или времени изменения отдаётся 304.
+        """
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        renderer_format = getattr(renderer, 'format', None)
+        if not self.cache_rendered or renderer_format != 'json':
+            return Response(
+                self.get_cached_data(
+                    tags,
+                    params,
+                    lambda: self.prepare_cached_response(compute()).data,
+                    )
+                )
+        params = f'{params}_{self.request.accepted_media_type}'
+        key = get_cache_key(*tags, params=params, local=self.cache_local)
+        meta_key = f'{key}:meta'
+        headers = self.request.headers
+        if 'If-None-Match' in headers or 'If-Modified-Since' in headers:
+            meta = cache_get(meta_key)
+            if meta is not None:
+                not_modified = get_conditional_response(self.request, *meta)
+                if not_modified is not None:
+                    return self.set_validators(not_modified, *meta)
+        content, content_type, etag, last_modified = self.get_cached_data(
+            tags,
+            params,
+            lambda: self.render_response(
+                self.prepare_cached_response(compute()), meta_key,
+                ),
+            key,
+            )
+        response = self.set_validators(
+            HttpResponse(content, content_type=content_type),
+            etag,
+            last_modified,
+            )
+        return get_conditional_response(
+            self.request, etag, last_modified, response,
+            )
+
+
+class QuerysetCachedMixin(DataCachedMixin, GenericAPIView):
+    """
+    Кэширование первичных ключей отфильтрованного queryset.
+
+    Все страницы одного фильтра используют общий список ключей,
+    на странице загружаются только её объекты.
+    """
+
+    def paginate_queryset(
+            self, queryset: QuerySet[Model]
+            ) -> list[Model] | None:
+        """Пагинация по закэшированным первичным ключам."""
+        paginator = self.paginator
+        if not isinstance(paginator, LimitOffsetPagination):
+            return super().paginate_queryset(queryset)
+        params = hash_cache_params(get_filter_cache_params(self))
+        key = get_cache_key(
+            self.tag_cache,
+            f'{self.tag_cache}_queryset',
+            params=f'_pks_{params}',
+            )
+
+        tags = ()
+        if self.is_cache_ordering_dependent():
+            tags = tuple(self.cache_dependencies)
+        pks = get_or_set_dependent_cache(
+            key,
+            lambda: list(queryset.values_list('pk', flat=True)),
+            tags,
+            self.get_cache_dependencies,
+            )
+        return super().paginate_queryset(
+            CachedPkList(self.get_queryset(), pks)
+            )
 
 
-class ListCachedMixin(ListModelMixin):
+class ListCachedMixin(ListModelMixin, DataCachedMixin):
     """Кэширование вывода списка."""
 
-    def list(self, request: Request, *args, **kwargs) -> Response:
+    def paginate_queryset(
+            self, queryset: QuerySet[Model]
+            ) -> list[Model] | None:
+        """Запоминает объекты страницы для зависимостей кэша."""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.cache_objects = page
+        return page
+
+    def get_list_cache_tags(self) -> tuple[str, ...]:
+        """Отдаёт теги кэша списка."""
+        return (self.tag_cache, f'{self.tag_cache}_queryset')
+
+    def get_list_cache_params(self) -> dict[str, Any]:
+        """Отдаёт параметры запроса, влияющие на вывод списка."""
+        return {
+            **get_filter_cache_params(self),
+            **get_pagination_cache_params(self),
+            **get_fields_cache_params(self),
+            }
+
+    def list(
+            self, request: Request, *args, **kwargs
+            ) -> HttpResponseBase:
         """Кэширование отфильтрованных данных."""
-        params = dict(sorted(request.GET.items())).__str__()
-        key = f'{self.tag_cache}_queryset_{params}'
-        data = cache.get(key)
-        if not data:
-            response = super().list(request, *args, **kwargs)
-            cache.set(key, response.data)
-            return response
-        return Response(data)
+        params = hash_cache_params(self.get_list_cache_params())
+        return self.get_cached_response(
+            self.get_list_cache_tags(),
+            f'_{params}',
+            lambda: super(ListCachedMixin, self).list(
+                request, *args, **kwargs
+                ),
+            )
 
 
 class ListQuerysetCachedMixin(ListCachedMixin, QuerysetCachedMixin):
@@ -61,29 +844,38 @@ class ObjectCachedMixin(GenericAPIView):
     def get_object(self) -> Model:
         """Кеширование объекта."""
         lookup = self.kwargs[self.lookup_field]
-        key = f'{self.tag_cache}_object_{lookup}'
-        obj = cache.get(key)
-        if not obj:
+        key = get_cache_key(
+            self.tag_cache, f'{self.tag_cache}_object_{lookup}',
+            )
+        obj = cache_get(key, MISSING)
+        if obj is MISSING:
             obj = super().get_object()
-            cache.set(key, obj)
+            cache_set(key, obj)
         return obj
 
 
-class RetrieveCachedMixin(RetrieveModelMixin):
+class RetrieveCachedMixin(RetrieveModelMixin, DataCachedMixin):
     """Кеширование вывода объекта."""
 
+    def get_object(self) -> Model:
+        """Запоминает объект для зависимостей кэша."""
+        obj = super().get_object()
+        self.cache_objects = (obj,)
+        return obj
+
     def retrieve(
             self, request: Request, *args, **kwargs
-            ) -> Response:
+            ) -> HttpResponseBase:
         """Кеширование вывода объекта."""
         lookup = self.kwargs[self.lookup_field]
-        key = f'{self.tag_cache}_retrieve_{lookup}'
-        data = cache.get(key)
-        if not data:
-            response = super().retrieve(request, *args, **kwargs)
-            cache.set(key, response.data)
-            return response
-        return Response(data)
+        params = get_fields_cache_params(self)
+        return self.get_cached_response(
+            (self.tag_cache, f'{self.tag_cache}_retrieve_{lookup}'),
+            f'_{hash_cache_params(params)}' if params else '',
+            lambda: super(RetrieveCachedMixin, self).retrieve(
+                request, *args, **kwargs
+                ),
+            )
 
 
 class RetrieveObjectCachedMixin(RetrieveCachedMixin, ObjectCachedMixin):
@@ -1,46 +1,83 @@
-from django.core.cache import cache
-from django.db.models import F, Sum
+from collections.abc import Iterable
+from typing import Any
 
-from collectings.models import Collect
+from django.db.models import Count, Model, Sum
+
+from collectings.models import Collect, Payment
 from organizations.models import Organization
+from utils.caching import cache_get_many, cache_set_many, get_cache_keys
+
+COUNTERS = {
+    'count_amount_collect': (
+        'collect_id', {'status': 'succeeded'}, Sum('payment_amount'),
+        ),
+    'count_donaters_collect': (
+        'collect_id', {'status': 'succeeded'}, Count('user', distinct=True),
+        ),
+    'count_amount_organization': (
+        'collect__organization_id', {'status': 'succeeded'},
+        Sum('payment_amount'),
+        ),
+}
+
+
+def get_counters(
+        counter: str, objs: Iterable[Model],
+        ) -> dict[int, Any]:
+    """
+    Отдаёт значения счётчика для объектов.
+
+    Значения читаются из кэша одним запросом, промахи вычисляются одним
+    запросом с GROUP BY и записываются в кэш одним запросом.
+    """
+    ids = list({obj.id for obj in objs})
+    keys = dict(zip(ids, get_cache_keys([f'{counter}_{id}' for id in ids])))
+    cached = cache_get_many(list(keys.values()))
+    counters = {id: cached[key] for id, key in keys.items() if key in cached}
+    missing_ids = [id for id in ids if id not in counters]
+    if not missing_ids:
+        return counters
+    lookup, filters, aggregate = COUNTERS[counter]
+    values = dict(
+        Payment.objects.filter(
+            **filters, **{f'{lookup}__in': missing_ids},
+            ).values(lookup).annotate(
+                value=aggregate,
+                ).values_list(lookup, 'value')
+        )
+    empty = aggregate.empty_result_set_value
+    for id in missing_ids:
+        counters[id] = values.get(id, empty)
+    cache_set_many({keys[id]: counters[id] for id in missing_ids})
+    return counters
+
+
+def resolve_counters(counter: str, objs: Iterable[Model]) -> None:
+    """Запоминает значения счётчика в объектах для вывода страницы."""
+    objs = list(objs)
+    counters = get_counters(counter, objs)
+    for obj in objs:
+        obj.__dict__.setdefault('_counters', {})[counter] = counters[obj.id]
+
+
+def get_counter(counter: str, obj: Model) -> Any:
+    """Отдаёт запомненное в объекте или закэшированное значение счётчика."""
+    resolved = obj.__dict__.get('_counters', {})
+    if counter in resolved:
+        return resolved[counter]
+    return get_counters(counter, (obj,))[obj.id]
 
 
 def get_count_amount_collect(obj: Collect) -> int | None:
     """Собранная сумма."""
-    key = f'count_amount_collect_{obj.id}'
-    count_amount = cache.get(key)
-    if count_amount:
-        return count_amount
-    count_amount = obj.payments.filter(
-        status='succeeded'
-        ).aggregate(
-        count_amount=Sum('payment_amount')
-        )['count_amount']
-    cache.set(key, count_amount)
-    return count_amount
+    return get_counter('count_amount_collect', obj)
 
 
 def get_count_donaters_collect(obj: Collect) -> int | None:
     """Количество пожертвований."""
-    key = f'count_donaters_collect_{obj.id}'
-    count_donaters = cache.get(key)
-    if count_donaters:
-        return count_donaters
-    count_donaters = obj.payments.filter(
-        status='succeeded'
-        ).values('user').distinct().count()
-    cache.set(key, count_donaters)
-    return count_donaters
+    return get_counter('count_donaters_collect', obj)
 
 
 def get_count_amount_organization(obj: Organization) -> int | None:
     """Собранная сумма."""
-    key = f'count_amount_organization_{obj.id}'
-    count_amount = cache.get(key)
-    if count_amount:
-        return count_amount
-    count_amount = obj.collectings.aggregate(
-            count_amount=Sum(F('payments__payment_amount'))
-        )['count_amount']
-    cache.set(key, count_amount)
-    return count_amount
+    return get_counter('count_amount_organization', obj)
@@ -0,0 +1,224 @@
+from collections.abc import Callable
+from operator import itemgetter
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Field, Model, QuerySet
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from utils.querysets import QueryPlanMixin
+
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+Getter = Callable[[dict[str, Any]], Any]
+
+
+class CompiledSerializer:
+    """
+    Сериализатор вывода строк values() без полей DRF.
+
+    Каждое поле заменено функцией, читающей значение строки,
+    поэтому вывод совпадает с выводом исходного сериализатора.
+    """
+
+    def __init__(
+            self, columns: list[str], getters: list[tuple[str, Getter]],
+            ) -> None:
+        self.columns = tuple(dict.fromkeys(columns))
+        self.getters = getters
+        self.instance = None
+
+    def to_representation(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Отдаёт вывод строки."""
+        return {name: getter(row) for name, getter in self.getters}
+
+    @property
+    def data(self) -> list[dict[str, Any]]:
+        """Отдаёт вывод строк instance."""
+        return [self.to_representation(row) for row in self.instance]
+
+
+def _get_scalar_getter(
+        column: str, to_representation: Callable[[Any], Any],
+        ) -> Getter:
+    """Отдаёт функцию вывода значения полем DRF."""
+    def getter(row: dict[str, Any]) -> Any:
+        value = row[column]
+        return None if value is None else to_representation(value)
+    return getter
+
+
+def _get_file_getter(
+        column: str, model_field: Field, request: Request,
+        ) -> Getter:
+    """
+    Отдаёт функцию вывода полной ссылки на файл.
+
+    Для хранилища в файловой системе префикс ссылки вычисляется
+    один раз, как его строят storage.url() и build_absolute_uri().
+    """
+    storage = model_field.storage
+    if isinstance(storage, FileSystemStorage):
+        prefix = request.build_absolute_uri(storage.base_url)
+
+        def getter(row: dict[str, Any]) -> str | None:
+            name = row[column]
+            if not name:
+                return None
+            return prefix + filepath_to_uri(name).lstrip('/')
+        return getter
+
+    def getter(row: dict[str, Any]) -> str | None:
+        name = row[column]
+        return request.build_absolute_uri(storage.url(name)) if name else None
+    return getter
+
+
+def _get_nested_getter(
+        column: str, getters: list[tuple[str, Getter]],
+        ) -> Getter:
+    """Отдаёт функцию вывода вложенного объекта."""
+    def getter(row: dict[str, Any]) -> dict[str, Any] | None:
+        if row[column] is None:
+            return None
+        return {name: nested(row) for name, nested in getters}
+    return getter
+
+
+def _compile_fields(
+        serializer: serializers.Serializer,
+        model: type[Model],
+        request: Request | None,
+        prefix: str = '',
+        ) -> tuple[list[str], list[tuple[str, Getter]]] | None:
+    """Отдаёт колонки values() и функции вывода полей сериализатора."""
+    columns = []
+    getters = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if (
+            '.' in field.source or field.source == '*' or
+            isinstance(field, (
+                serializers.SerializerMethodField,
+                serializers.ListSerializer,
+                serializers.ManyRelatedField,
+            ))
+        ):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        column = f'{prefix}{field.source}'
+        if isinstance(field, serializers.Serializer):
+            nested = _compile_fields(
+                field, model_field.related_model, request, f'{column}__',
+                )
+            if nested is None:
+                return None
+            columns += [column, *nested[0]]
+            getter = _get_nested_getter(column, nested[1])
+        elif isinstance(field, serializers.SlugRelatedField):
+            column = f'{column}__{field.slug_field}'
+            columns.append(column)
+            getter = itemgetter(column)
+        elif (
+            isinstance(field, serializers.PrimaryKeyRelatedField) and
+            field.pk_field is None
+        ):
+            columns.append(column)
+            getter = itemgetter(column)
+        elif (
+            isinstance(field, serializers.RelatedField) or
+            model_field.is_relation
+        ):
+            return None
+        elif isinstance(field, serializers.FileField):
+            if request is None or not getattr(
+                field, 'use_url', api_settings.UPLOADED_FILES_USE_URL,
+            ):
+                return None
+            columns.append(column)
+            getter = _get_file_getter(column, model_field, request)
+        elif isinstance(field, IDENTITY_FIELDS):
+            columns.append(column)
+            getter = itemgetter(column)
+        else:
+            columns.append(column)
+            getter = _get_scalar_getter(column, field.to_representation)
+        getters.append((field.field_name, getter))
+    return columns, getters
+
+
+def compile_serializer(
+        serializer: serializers.Serializer,
+        ) -> CompiledSerializer | None:
+    """
+    Отдаёт скомпилированный сериализатор вывода.
+
+    Поля методов, множественные и составные поля не компилируются,
+    для таких сериализаторов отдаётся None.
+    """
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    compiled = _compile_fields(
+        serializer, model, serializer.context.get('request'),
+        )
+    return compiled and CompiledSerializer(*compiled)
+
+
+class CompiledSerializerMixin(QueryPlanMixin):
+    """
+    Вывод списка скомпилированным сериализатором из строк values().
+
+    Строки содержат pk и query_plan_only, поэтому пагинация и
+    зависимости кэша работают с ними так же, как с объектами.
+    """
+
+    use_compiled_serializer = True
+
+    def get_compiled_serializer(self) -> CompiledSerializer | None:
+        """Отдаёт скомпилированный сериализатор вывода списка."""
+        if not hasattr(self, '_compiled_serializer'):
+            self._compiled_serializer = None
+            if (
+                self.use_compiled_serializer and
+                self.request.method == 'GET' and
+                getattr(self, 'action', 'list') == 'list'
+            ):
+                self._compiled_serializer = compile_serializer(
+                    self.get_serializer_class()(
+                        context={'request': self.request, 'view': self},
+                        )
+                    )
+        return self._compiled_serializer
+
+    def get_queryset(self) -> QuerySet[Model]:
+        """Отдаёт строки values() для скомпилированного сериализатора."""
+        queryset = super().get_queryset()
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return queryset
+        return queryset.values(
+            *dict.fromkeys(('pk', *self.query_plan_only, *compiled.columns))
+            )
+
+    def get_serializer(
+            self, *args, **kwargs,
+            ) -> serializers.BaseSerializer | CompiledSerializer:
+        """Отдаёт скомпилированный сериализатор для вывода списка."""
+        compiled = self.get_compiled_serializer()
+        if compiled is None or not kwargs.get('many'):
+            return super().get_serializer(*args, **kwargs)
+        compiled.instance = args[0]
+        return compiled
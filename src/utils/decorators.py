@@ -3,13 +3,21 @@ from functools import wraps
 from django.db.models import Model
 from rest_framework.serializers import Serializer
 
+from utils.identity_map import get_identity_map
+from utils.querysets import get_query_plan, plan_queryset
+
 
 def change_serializer_class(
         serializer: Serializer,
         model: Model | None = None,
         name_field_filter: str = 'id',
 ):
-    """Изменяет serializer для возвращаемых данных."""
+    """
+    Изменяет serializer для возвращаемых данных.
+
+    Объект берётся из загруженных за время запроса, связанные данные
+    догружаются по плану сериализатора.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -21,10 +29,17 @@ def change_serializer_class(
                     context={'request': request},
                 ).data
                 return response
-            data_field_filter = response.data.get(name_field_filter)
-            obj = model.objects.get(
-                **{name_field_filter: data_field_filter}
-                )
+            lookups = {name_field_filter: response.data.get(name_field_filter)}
+            output = serializer(context={'request': request})
+            identity_map = get_identity_map(request)
+            obj = identity_map.get(model, **lookups)
+            if obj is None:
+                obj = plan_queryset(model.objects.all(), output).get(**lookups)
+            else:
+                plan = get_query_plan(output, model)
+                identity_map.load_related(
+                    obj, plan.select_related, plan.prefetch_related,
+                    )
             response.data = serializer(
                 obj,
                 context={'request': request},
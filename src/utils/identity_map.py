@@ -0,0 +1,135 @@
+from collections.abc import Iterable
+from typing import Any
+
+from django.db.models import Model, QuerySet, prefetch_related_objects
+from django.http import HttpRequest
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+
+IDENTITY_MAP_ATTR = 'identity_map'
+
+
+class IdentityMap:
+    """
+    Объекты, загруженные за время запроса.
+
+    Объекты хранятся по модели и первичному ключу, поэтому каждый
+    объект загружается из БД не больше одного раза за запрос.
+    """
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[type[Model], Any], Model] = {}
+
+    def add(self, obj: Model) -> Model:
+        """Добавляет объект и отдаёт его."""
+        if obj.pk is not None:
+            self.objects[(obj._meta.concrete_model, obj.pk)] = obj
+        return obj
+
+    def add_data(self, data: Any) -> None:
+        """Добавляет объекты из проверенных данных сериализатора."""
+        if isinstance(data, Model):
+            self.add(data)
+        elif isinstance(data, dict):
+            for value in data.values():
+                self.add_data(value)
+        elif isinstance(data, (list, tuple)):
+            for value in data:
+                self.add_data(value)
+
+    def get(self, model: type[Model], **lookups) -> Model | None:
+        """Отдаёт объект модели с указанными значениями полей."""
+        model = model._meta.concrete_model
+        if lookups.keys() == {'pk'}:
+            return self.objects.get((model, lookups['pk']))
+        for (obj_model, _), obj in self.objects.items():
+            if obj_model is model and all(
+                getattr(obj, name) == value for name, value in lookups.items()
+            ):
+                return obj
+        return None
+
+    def fetch(self, queryset: QuerySet[Model], **lookups) -> Model:
+        """Отдаёт объект, загружая его из БД при отсутствии."""
+        obj = self.get(queryset.model, **lookups)
+        if obj is None:
+            obj = self.add(queryset.get(**lookups))
+        return obj
+
+    def load_related(
+            self,
+            obj: Model,
+            select_related: Iterable[str] = (),
+            prefetch_related: Iterable[str] = (),
+            ) -> None:
+        """
+        Загружает связанные объекты.
+
+        Связи select_related берутся из уже загруженных объектов,
+        остальные загружаются одним запросом на связь.
+        """
+        select_related = tuple(select_related)
+        for path in select_related:
+            *parents, name = path.split('__')
+            related = obj
+            for parent in parents:
+                related = getattr(related, parent)
+                if related is None:
+                    break
+            else:
+                self._set_cached(related, name)
+        prefetch_related_objects([obj], *select_related, *prefetch_related)
+
+    def _set_cached(self, obj: Model, name: str) -> None:
+        """Заполняет связь объекта из загруженных объектов."""
+        field = obj._meta.get_field(name)
+        if not field.many_to_one and not field.one_to_one:
+            return
+        if not field.concrete or field.is_cached(obj):
+            return
+        related = self.get(
+            field.related_model, pk=getattr(obj, field.attname),
+            )
+        if related is not None:
+            field.set_cached_value(obj, related)
+
+
+def get_identity_map(request: Request | HttpRequest) -> IdentityMap:
+    """Отдаёт объекты, загруженные за время запроса."""
+    request = getattr(request, '_request', request)
+    identity_map = getattr(request, IDENTITY_MAP_ATTR, None)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        setattr(request, IDENTITY_MAP_ATTR, identity_map)
+    return identity_map
+
+
+class IdentityMapMixin(GenericAPIView):
+    """
+    Сохранение объектов запроса для повторного использования.
+
+    Запоминает объект запроса, объекты, найденные при проверке
+    данных, и сохранённый объект.
+    """
+
+    @property
+    def identity_map(self) -> IdentityMap:
+        """Отдаёт объекты, загруженные за время запроса."""
+        return get_identity_map(self.request)
+
+    def get_object(self) -> Model:
+        """Запоминает объект запроса."""
+        return self.identity_map.add(super().get_object())
+
+    def perform_create(self, serializer: BaseSerializer) -> None:
+        """Запоминает объекты данных и созданный объект."""
+        super().perform_create(serializer)
+        self.identity_map.add_data(serializer.validated_data)
+        self.identity_map.add_data(serializer.instance)
+
+    def perform_update(self, serializer: BaseSerializer) -> None:
+        """Запоминает объекты данных и изменённый объект."""
+        super().perform_update(serializer)
+        self.identity_map.add_data(serializer.validated_data)
+        self.identity_map.add_data(serializer.instance)
@@ -0,0 +1,446 @@
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework.response import Response
+
+from collectings.models import Collect, Payment
+from core.constants import (LIVE_COUNTERS_RECONCILED_KEY, LIVE_DONORS_HLL_KEY,
+                            LIVE_DONORS_KEY, LIVE_ORGANIZATION_DONORS_HLL_KEY,
+                            LIVE_ORGANIZATION_DONORS_KEY,
+                            LIVE_ORGANIZATION_TOTALS_KEY, LIVE_TOTALS_KEY)
+from organizations.models import Organization
+from utils.cache_metrics import redis_timer
+from utils.caching import DataCachedMixin
+
+ADD_DONATION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'amount', ARGV[1])
+if ARGV[2] ~= '' then
+    if ARGV[3] == '1' then
+        redis.call('PFADD', KEYS[2], ARGV[2])
+    else
+        redis.call('SADD', KEYS[2], ARGV[2])
+    end
+end
+return 1
+"""
+SET_AMOUNT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'amount', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+KeysGetter = Callable[[int], tuple[str, str]]
+
+
+def is_approximate_donors() -> bool:
+    """Проверяет режим приближённого подсчёта жертвователей."""
+    return settings.LIVE_COUNTERS_APPROXIMATE_DONORS
+
+
+def get_live_keys(collect_id: int) -> tuple[str, str]:
+    """
+    Отдаёт ключи Redis суммы и жертвователей сбора.
+
+    В приближённом режиме жертвователи хранятся в HyperLogLog
+    под отдельным ключом, а не во множестве.
+    """
+    donors_key = (
+        LIVE_DONORS_HLL_KEY if is_approximate_donors() else LIVE_DONORS_KEY
+        )
+    return (
+        cache.make_key(LIVE_TOTALS_KEY.format(collect_id)),
+        cache.make_key(donors_key.format(collect_id)),
+        )
+
+
+def get_live_organization_keys(organization_id: int) -> tuple[str, str]:
+    """Отдаёт ключи Redis суммы и жертвователей организации."""
+    donors_key = (
+        LIVE_ORGANIZATION_DONORS_HLL_KEY if is_approximate_donors()
+        else LIVE_ORGANIZATION_DONORS_KEY
+        )
+    return (
+        cache.make_key(LIVE_ORGANIZATION_TOTALS_KEY.format(organization_id)),
+        cache.make_key(donors_key.format(organization_id)),
+        )
+
+
+def add_live_donation(
+        collect_id: int, organization_id: int, user_id: int | None,
+        amount: int,
+        ) -> None:
+    """
+    Учитывает успешный платёж в счётчиках сбора и организации.
+
+    Незаполненные счётчики не меняются, они заполняются из БД
+    при чтении, поэтому платёж не учитывается дважды.
+    """
+    with redis_timer(LIVE_TOTALS_KEY):
+        pipeline = get_redis_connection().pipeline(transaction=False)
+        for keys in (
+            get_live_keys(collect_id),
+            get_live_organization_keys(organization_id),
+        ):
+            pipeline.eval(
+                ADD_DONATION_SCRIPT,
+                2,
+                *keys,
+                amount,
+                '' if user_id is None else user_id,
+                int(is_approximate_donors()),
+                )
+        pipeline.execute()
+
+
+def set_live_counters(
+        get_keys: KeysGetter,
+        amounts: dict[int, int],
+        donors: dict[int, set[int]],
+        ) -> None:
+    """Записывает суммы и жертвователей в счётчики."""
+    timeout = settings.LIVE_COUNTERS_TIMEOUT
+    with redis_timer(LIVE_TOTALS_KEY):
+        pipeline = get_redis_connection().pipeline()
+        for obj_id, amount in amounts.items():
+            totals_key, donors_key = get_keys(obj_id)
+            pipeline.delete(totals_key, donors_key)
+            pipeline.hset(
+                totals_key,
+                mapping={
+                    'amount': amount,
+                    'approximate': int(is_approximate_donors()),
+                    },
+                )
+            pipeline.expire(totals_key, timeout)
+            if donors[obj_id]:
+                if is_approximate_donors():
+                    pipeline.pfadd(donors_key, *donors[obj_id])
+                else:
+                    pipeline.sadd(donors_key, *donors[obj_id])
+                pipeline.expire(donors_key, timeout)
+        pipeline.execute()
+
+
+def _rebuild(
+        model: type[Model],
+        lookup: str,
+        get_keys: KeysGetter,
+        ids: Iterable[int],
+        ) -> None:
+    """Заполняет счётчики объектов из итогов и платежей в БД."""
+    amounts = dict(
+        model.objects.filter(id__in=list(ids)).values_list(
+            'id', 'collected_amount',
+            )
+        )
+    donors = {obj_id: set() for obj_id in amounts}
+    for obj_id, user_id in Payment.objects.filter(
+        **{f'{lookup}__in': amounts},
+        status='succeeded',
+        user__isnull=False,
+    ).values_list(lookup, 'user_id').distinct():
+        donors[obj_id].add(user_id)
+    set_live_counters(get_keys, amounts, donors)
+
+
+def rebuild_live_counters(collect_ids: Iterable[int]) -> None:
+    """Заполняет счётчики сборов из итогов и платежей в БД."""
+    _rebuild(Collect, 'collect_id', get_live_keys, collect_ids)
+
+
+def rebuild_live_organization_counters(
+        organization_ids: Iterable[int],
+        ) -> None:
+    """Заполняет счётчики организаций из итогов и платежей в БД."""
+    _rebuild(
+        Organization,
+        'collect__organization_id',
+        get_live_organization_keys,
+        organization_ids,
+        )
+
+
+def _reconcile(
+        model: type[Model],
+        lookup: str,
+        get_keys: KeysGetter,
+        rebuild: Callable[[Iterable[int]], None],
+        ids: Iterable[int],
+        changed_since: datetime | None,
+        ) -> None:
+    """Сверяет суммы счётчиков объектов с итогами в БД."""
+    amounts = dict(
+        model.objects.filter(id__in=list(ids)).values_list(
+            'id', 'collected_amount',
+            )
+        )
+    connection = get_redis_connection()
+    with redis_timer(LIVE_TOTALS_KEY):
+        pipeline = connection.pipeline(transaction=False)
+        for obj_id in amounts:
+            pipeline.hget(get_keys(obj_id)[0], 'approximate')
+        modes = pipeline.execute()
+    approximate = int(is_approximate_donors())
+    rebuild_ids = {
+        obj_id for obj_id, mode in zip(amounts, modes)
+        if mode is None or int(mode) != approximate
+        }
+    if changed_since is None:
+        rebuild_ids = set(amounts)
+    else:
+        rebuild_ids.update(
+            Payment.objects.filter(
+                **{f'{lookup}__in': amounts},
+                succeeded_datetime__gte=changed_since,
+                ).values_list(lookup, flat=True).distinct()
+            )
+    if rebuild_ids:
+        rebuild(rebuild_ids)
+    with redis_timer(LIVE_TOTALS_KEY):
+        pipeline = connection.pipeline(transaction=False)
+        for obj_id, amount in amounts.items():
+            if obj_id not in rebuild_ids:
+                pipeline.eval(
+                    SET_AMOUNT_SCRIPT,
+                    2,
+                    *get_keys(obj_id),
+                    amount,
+                    settings.LIVE_COUNTERS_TIMEOUT,
+                    )
+        pipeline.execute()
+
+
+def reconcile_live_counters(
+        collect_ids: Iterable[int], changed_since: datetime | None = None,
+        ) -> None:
+    """
+    Сверяет суммы счётчиков сборов с итогами в БД.
+
+    Жертвователи пересобираются только для сборов без счётчиков или
+    со счётчиками другого режима и для сборов с платежами, успешными
+    начиная с changed_since. Без changed_since пересобираются все.
+    """
+    _reconcile(
+        Collect,
+        'collect_id',
+        get_live_keys,
+        rebuild_live_counters,
+        collect_ids,
+        changed_since,
+        )
+
+
+def reconcile_live_organization_counters(
+        organization_ids: Iterable[int],
+        changed_since: datetime | None = None,
+        ) -> None:
+    """Сверяет суммы счётчиков организаций с итогами в БД."""
+    _reconcile(
+        Organization,
+        'collect__organization_id',
+        get_live_organization_keys,
+        rebuild_live_organization_counters,
+        organization_ids,
+        changed_since,
+        )
+
+
+def reconcile_active_live_counters(chunk_size: int) -> None:
+    """
+    Сверяет счётчики активных сборов и организаций частями.
+
+    Время начала сверки сохраняется, следующая сверка пересобирает
+    жертвователей только сборов и организаций с платежами, успешными
+    после него.
+    """
+    started = timezone.now()
+    changed_since = cache.get(LIVE_COUNTERS_RECONCILED_KEY)
+    for reconcile, queryset in (
+        (
+            reconcile_live_counters,
+            Collect.objects.filter(is_active=True),
+        ),
+        (
+            reconcile_live_organization_counters,
+            Organization.objects.all(),
+        ),
+    ):
+        ids = list(queryset.values_list('id', flat=True))
+        for i in range(0, len(ids), chunk_size):
+            reconcile(ids[i:i + chunk_size], changed_since)
+    cache.set(LIVE_COUNTERS_RECONCILED_KEY, started, timeout=None)
+
+
+def _get_live_totals(
+        ids: list[int],
+        get_keys: KeysGetter,
+        rebuild: Callable[[Iterable[int]], None],
+        ) -> dict[int, dict[str, int]]:
+    """
+    Отдаёт итоги объектов из счётчиков, заполняя недостающие.
+
+    Счётчики, заполненные в другом режиме подсчёта жертвователей,
+    заполняются заново. Жертвователи считаются SCARD или PFCOUNT
+    одного ключа за постоянное время.
+    """
+    connection = get_redis_connection()
+    amounts = {}
+    missing_ids = ids
+    for _ in range(2):
+        with redis_timer(LIVE_TOTALS_KEY):
+            pipeline = connection.pipeline(transaction=False)
+            for obj_id in missing_ids:
+                pipeline.hmget(get_keys(obj_id)[0], 'amount', 'approximate')
+            values = pipeline.execute()
+        approximate = int(is_approximate_donors())
+        for obj_id, (amount, mode) in zip(missing_ids, values):
+            if amount is not None and int(mode or 0) == approximate:
+                amounts[obj_id] = int(amount)
+        missing_ids = [
+            obj_id for obj_id in missing_ids if obj_id not in amounts
+            ]
+        if not missing_ids:
+            break
+        rebuild(missing_ids)
+    with redis_timer(LIVE_TOTALS_KEY):
+        pipeline = connection.pipeline(transaction=False)
+        for obj_id in ids:
+            donors_key = get_keys(obj_id)[1]
+            if is_approximate_donors():
+                pipeline.pfcount(donors_key)
+            else:
+                pipeline.scard(donors_key)
+        donors = pipeline.execute()
+    return {
+        obj_id: {
+            'count_amount': amounts.get(obj_id, 0),
+            'count_donaters': obj_donors,
+            }
+        for obj_id, obj_donors in zip(ids, donors)
+        }
+
+
+def get_live_totals_many(
+        collect_ids: list[int],
+        ) -> dict[int, dict[str, int]]:
+    """Отдаёт собранные суммы и числа жертвователей сборов из Redis."""
+    return _get_live_totals(collect_ids, get_live_keys, rebuild_live_counters)
+
+
+def get_live_totals(collect_id: int) -> dict[str, int]:
+    """Отдаёт собранную сумму и число жертвователей сбора из Redis."""
+    return get_live_totals_many([collect_id])[collect_id]
+
+
+def get_live_organization_totals_many(
+        organization_ids: list[int],
+        ) -> dict[int, dict[str, int]]:
+    """
+    Отдаёт итоги организаций из их счётчиков в Redis.
+
+    Счётчики организации ведутся отдельно от счётчиков её сборов,
+    поэтому чтение не зависит от числа сборов, а жертвователь
+    нескольких сборов учитывается один раз.
+    """
+    return _get_live_totals(
+        organization_ids,
+        get_live_organization_keys,
+        rebuild_live_organization_counters,
+        )
+
+
+def get_live_organization_totals(organization_id: int) -> dict[str, int]:
+    """Отдаёт собранную сумму и число жертвователей организации из Redis."""
+    return get_live_organization_totals_many(
+        [organization_id],
+        )[organization_id]
+
+
+def update_live_counters(
+        old_state: dict[str, Any] | None, new_state: dict[str, Any] | None,
+        ) -> None:
+    """
+    Переносит изменение платежа в счётчики сбора и организации.
+
+    Вызывается после фиксации транзакции сохранения или удаления платежа
+    с прежним состоянием, прочитанным под блокировкой строки, поэтому
+    переход в статус succeeded учитывается один раз. Отмена, изменение
+    или удаление успешного платежа заново заполняет счётчики из БД.
+    """
+    if old_state == new_state:
+        return
+    states = [state for state in (old_state, new_state) if state is not None]
+    organizations = dict(
+        Collect.objects.filter(
+            pk__in={state['collect_id'] for state in states},
+            ).values_list('pk', 'organization_id')
+        )
+    if old_state is not None and old_state['status'] == 'succeeded':
+        rebuild_live_counters(organizations.keys())
+        rebuild_live_organization_counters(set(organizations.values()))
+    elif new_state is not None and new_state['status'] == 'succeeded':
+        add_live_donation(
+            new_state['collect_id'],
+            organizations[new_state['collect_id']],
+            new_state['user_id'],
+            new_state['payment_amount'],
+            )
+
+
+class LiveTotalsMixin(DataCachedMixin):
+    """
+    Вывод итогов из счётчиков Redis.
+
+    Итоги объектов ответа и вложенных объектов заменяются значениями
+    счётчиков, колонки итогов в БД используются для сортировки
+    и сверки счётчиков.
+    live_totals: поле вывода (None для самого объекта), атрибут
+    с идентификатором и функция чтения итогов по идентификаторам.
+    """
+
+    live_totals: tuple[
+        tuple[str | None, str, Callable[[list[int]], dict]], ...
+        ] = ()
+
+    def set_live_totals(self, data: list[dict[str, Any]]) -> None:
+        """Заменяет итоги в выводе объектов ответа."""
+        for field, attr, get_totals in self.live_totals:
+            items = {}
+            for item, obj in zip(data, self.cache_objects):
+                if field is not None:
+                    item = item.get(field)
+                if item:
+                    obj_id = obj[attr] if isinstance(obj, dict) else getattr(
+                        obj, attr,
+                        )
+                    items.setdefault(obj_id, []).append(item)
+            if not items:
+                continue
+            totals = get_totals(list(items))
+            for obj_id, obj_items in items.items():
+                for item in obj_items:
+                    for name, value in totals[obj_id].items():
+                        if name in item:
+                            item[name] = value
+
+    def prepare_cached_response(self, response: Response) -> Response:
+        """Выводит итоги объектов ответа из счётчиков."""
+        response = super().prepare_cached_response(response)
+        if getattr(self, 'action', 'list') == 'list':
+            self.set_live_totals(response.data['results'])
+        else:
+            self.set_live_totals([response.data])
+        return response
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+
+class LocalCache:
+    """Ограниченный LRU-кэш процесса со временем жизни записей."""
+
+    def __init__(self, max_size: int, timeout: float) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Отдаёт значение, если оно не истекло."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expire_at, value = item
+            if expire_at < monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        """Сохраняет значение, вытесняя давно неиспользуемые."""
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            self._data[key] = (monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Удаляет значение."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._data.clear()
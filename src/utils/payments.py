@@ -1,12 +1,73 @@
 from datetime import timedelta
 
+import requests
 from django.conf import settings
 from django.utils.timezone import localtime
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from yookassa import Configuration
 from yookassa import Payment as YookassaPayment
+from yookassa.client import ApiClient
 from yookassa.domain.response.payment_response import PaymentResponse
 
 from collectings.models import Collect, Payment
-from utils.caching import clean_group_cache_by_tags
+from utils.caching import (clean_cache_by_dependencies,
+                           clean_group_cache_by_tags)
+
+
+class PooledSession(requests.Session):
+    """
+    Сессия с общим пулом соединений.
+
+    Запросы без таймаута получают YOOKASSA_TIMEOUT, закрытие после
+    запроса не разрывает соединения пула.
+    """
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        """Выполняет запрос с таймаутом."""
+        kwargs.setdefault('timeout', settings.YOOKASSA_TIMEOUT)
+        return super().request(*args, **kwargs)
+
+    def close(self) -> None:
+        """Оставляет соединения пула открытыми."""
+
+
+_session = None
+
+
+def get_yookassa_session() -> PooledSession:
+    """Отдаёт сессию процесса для запросов к ЮKassa."""
+    global _session
+    if _session is None:
+        _session = PooledSession()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.YOOKASSA_POOL_SIZE,
+            max_retries=Retry(
+                total=Configuration.max_attempts,
+                backoff_factor=Configuration.timeout / 1000,
+                allowed_methods=('POST',),
+                status_forcelist=(202,),
+                ),
+            )
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+class PooledApiClient(ApiClient):
+    """Клиент API ЮKassa на общей сессии процесса."""
+
+    def get_session(self) -> PooledSession:
+        """Отдаёт общую сессию."""
+        return get_yookassa_session()
+
+
+class PooledYookassaPayment(YookassaPayment):
+    """Платёж ЮKassa, запросы которого используют общую сессию."""
+
+    def __init__(self) -> None:
+        self.client = PooledApiClient()
 
 
 def create_payment(
@@ -16,8 +77,13 @@ def create_payment(
         payment_id: int,
         user_id: int
         ) -> str:
-    """Создание платежа."""
-    payment = YookassaPayment.create(
+    """
+    Создание платежа.
+
+    Ключ идемпотентности строится по платежу, поэтому повтор запроса
+    не создаёт второй платёж в ЮKassa.
+    """
+    payment = PooledYookassaPayment.create(
         {
             'amount': {
                 'value': amount,
@@ -37,17 +103,63 @@ def create_payment(
             'save_payment_method': False,
             'capture': True,
             'description': f'Пожертвование на "{collect.name}"',
-        }
+        },
+        f'payment-{payment_id}',
     )
     return payment.confirmation.confirmation_url
 
 
+def set_confirmation_url(payment_id: int, confirmation_url: str) -> None:
+    """Сохраняет ссылку на оплату платежа."""
+    Payment.objects.filter(pk=payment_id).update(
+        intent_status='ready', confirmation_url=confirmation_url,
+        )
+
+
+def create_payment_intent(payment_id: int) -> Payment | None:
+    """
+    Создаёт платёж в ЮKassa для записанного намерения оплаты.
+
+    Ссылка на оплату сохраняется в платеже. Отдаёт платёж или None,
+    если ссылка уже получена.
+    """
+    payment = Payment.objects.select_related('collect', 'user').get(
+        pk=payment_id,
+        )
+    if payment.intent_status != 'created':
+        return None
+    payment.confirmation_url = create_payment(
+        payment.collect,
+        payment.collect.slug,
+        payment.payment_amount,
+        payment.id,
+        payment.user_id,
+        )
+    payment.intent_status = 'ready'
+    set_confirmation_url(payment.pk, payment.confirmation_url)
+    return payment
+
+
+def fail_payment_intent(payment_id: int) -> None:
+    """Отмечает ошибку создания платежа в ЮKassa."""
+    Payment.objects.filter(pk=payment_id, intent_status='created').update(
+        intent_status='failed',
+        )
+
+
 def clean_cache(data_clean_cache: list[dict[str, str]]) -> None:
-    """Очистка кэша."""
-    from api.v1.views import CollectViewSet, PaymentView
+    """
+    Очистка кэша.
+
+    Страницы сборов и организаций очищаются только если содержат
+    сбор платежа или его организацию.
+    """
+    from api.v1.views import CollectViewSet, OrganizationView, PaymentView
     collect_tag_cache = CollectViewSet.tag_cache
+    organization_tag_cache = OrganizationView.tag_cache
     payment_tag_cache = PaymentView.tag_cache
     tags_cache = []
+    dependencies = {collect_tag_cache: set(), organization_tag_cache: set()}
     for data in data_clean_cache:
         collect_id = data['collect_id']
         lookup = data['collect_lookup']
@@ -61,13 +173,13 @@ def clean_cache(data_clean_cache: list[dict[str, str]]) -> None:
                 (
                     f'{collect_tag_cache}_object_{lookup}',
                     f'{collect_tag_cache}_retrieve_{lookup}',
-                    f'count_amount_collect_{collect_id}',
-                    f'count_donaters_collect_{collect_id}',
-                    f'count_amount_organization_{organization_id}',
-                    f'{collect_tag_cache}_queryset',
                 )
             )
+        dependencies[collect_tag_cache].add(collect_id)
+        dependencies[organization_tag_cache].add(organization_id)
     clean_group_cache_by_tags(set(tags_cache))
+    if dependencies[collect_tag_cache]:
+        clean_cache_by_dependencies(dependencies)
 
 
 def status_payments(payments: list[PaymentResponse]) -> None:
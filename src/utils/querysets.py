@@ -0,0 +1,140 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from rest_framework import serializers
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import SAFE_METHODS
+
+
+@dataclass
+class QueryPlan:
+    """Связанные данные и поля, нужные сериализатору."""
+
+    select_related: list[str] = field(default_factory=list)
+    prefetch_related: list[str] = field(default_factory=list)
+    only: list[str] = field(default_factory=list)
+    use_only: bool = True
+
+
+def _plan_field(
+        plan: QueryPlan,
+        serializer_field: serializers.Field,
+        model: type[Model],
+        prefix: str,
+        ) -> None:
+    """Добавляет в план поле сериализатора."""
+    if isinstance(serializer_field, serializers.SerializerMethodField):
+        plan.use_only = False
+        return
+    try:
+        model_field = model._meta.get_field(serializer_field.source)
+    except FieldDoesNotExist:
+        plan.use_only = False
+        return
+    name = f'{prefix}{serializer_field.source}'
+    if isinstance(
+        serializer_field,
+        (serializers.ListSerializer, serializers.ManyRelatedField),
+    ):
+        plan.prefetch_related.append(name)
+    elif isinstance(serializer_field, serializers.Serializer):
+        plan.select_related.append(name)
+        plan.only.append(name)
+        _plan_serializer(
+            plan, serializer_field, model_field.related_model, f'{name}__',
+            )
+    elif isinstance(serializer_field, serializers.PrimaryKeyRelatedField):
+        plan.only.append(name)
+    elif isinstance(serializer_field, serializers.SlugRelatedField):
+        plan.select_related.append(name)
+        plan.only += [name, f'{name}__{serializer_field.slug_field}']
+    elif model_field.is_relation:
+        plan.select_related.append(name)
+        plan.use_only = False
+    else:
+        plan.only.append(name)
+
+
+def _plan_serializer(
+        plan: QueryPlan,
+        serializer: serializers.Serializer,
+        model: type[Model],
+        prefix: str = '',
+        ) -> None:
+    """Добавляет в план выводимые поля сериализатора."""
+    for serializer_field in serializer.fields.values():
+        if serializer_field.write_only:
+            continue
+        if '.' in serializer_field.source or serializer_field.source == '*':
+            plan.use_only = False
+            continue
+        _plan_field(plan, serializer_field, model, prefix)
+
+
+def get_query_plan(
+        serializer: serializers.Serializer, model: type[Model],
+        ) -> QueryPlan:
+    """
+    Отдаёт план загрузки объектов модели для сериализатора.
+
+    Вложенные сериализаторы и поля slug загружаются через
+    select_related, множественные — через prefetch_related.
+    Поля методов и составные источники могут читать любые атрибуты,
+    поэтому с ними only() не применяется.
+    """
+    plan = QueryPlan()
+    _plan_serializer(plan, serializer, model)
+    return plan
+
+
+def plan_queryset(
+        queryset: QuerySet[Model],
+        serializer: serializers.Serializer,
+        use_only: bool = True,
+        only: Iterable[str] = (),
+        ) -> QuerySet[Model]:
+    """
+    Загружает связанные данные и поля, нужные сериализатору.
+
+    В only передаются поля, которые читаются помимо сериализатора.
+    """
+    if getattr(getattr(serializer, 'Meta', None), 'model', None) is not (
+        queryset.model
+    ):
+        return queryset
+    plan = get_query_plan(serializer, queryset.model)
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    if use_only and plan.use_only:
+        queryset = queryset.only(*plan.only, *only)
+    return queryset
+
+
+class QueryPlanMixin(GenericAPIView):
+    """
+    Загрузка связанных данных по сериализатору вывода.
+
+    План применяется только к чтению: объекты для изменения
+    загружаются полностью. Отдельный объект кэшируется и используется
+    при изменении, поэтому only() к нему не применяется.
+    """
+
+    query_plan_only: tuple[str, ...] = ()
+
+    def get_queryset(self) -> QuerySet[Model]:
+        """Отдаёт queryset с планом загрузки сериализатора."""
+        queryset = super().get_queryset()
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer = self.get_serializer_class()(
+            context={'request': self.request, 'view': self},
+            )
+        detail = (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+        return plan_queryset(
+            queryset, serializer,
+            use_only=not detail, only=self.query_plan_only,
+            )
@@ -0,0 +1,213 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Model, Q, QuerySet
+from django.utils import timezone
+
+from collectings.models import CollectRollup, Payment
+from core.constants import (ROLLUP_DEFAULT_RANGES, ROLLUP_LOCK_KEY,
+                            ROLLUP_LOCK_TIMEOUT, ROLLUP_PERIODS)
+from organizations.models import OrganizationRollup
+from utils.caching import (acquire_cache_lock, extend_cache_lock,
+                           release_cache_lock)
+
+ROLLUP_TARGETS = (
+    (CollectRollup, 'collect_id'),
+    (OrganizationRollup, 'organization_id'),
+)
+
+
+def get_period_bounds(
+        value: datetime, period: str,
+        ) -> tuple[datetime, datetime]:
+    """Отдаёт границы периода, в который попадает время."""
+    start = timezone.localtime(value).replace(
+        minute=0, second=0, microsecond=0,
+        )
+    if period == 'hour':
+        return start, start + timedelta(hours=1)
+    start = start.replace(hour=0)
+    return start, start + timedelta(days=1)
+
+
+def get_rolled_up_counts(payments: list[Payment]) -> Counter:
+    """
+    Считает учтённые платежи жертвователей платежей по периодам.
+
+    Ключ счётчика: период, его начало, пользователь, поле цели итогов
+    и её идентификатор. Платежи ищутся одним запросом в границах дней
+    переносимых платежей.
+    """
+    user_ids = {
+        payment.user_id for payment in payments if payment.user_id is not None
+        }
+    counts = Counter()
+    if not user_ids:
+        return counts
+    days = [
+        get_period_bounds(payment.succeeded_datetime, 'day')
+        for payment in payments
+        ]
+    for user_id, collect_id, organization_id, succeeded_datetime in (
+        Payment.objects.filter(
+            is_rolled_up=True,
+            user_id__in=user_ids,
+            succeeded_datetime__gte=min(start for start, _ in days),
+            succeeded_datetime__lt=max(end for _, end in days),
+            ).values_list(
+                'user_id', 'collect_id', 'collect__organization_id',
+                'succeeded_datetime',
+                )
+    ):
+        for period, _ in ROLLUP_PERIODS:
+            start, _ = get_period_bounds(succeeded_datetime, period)
+            counts[(period, start, user_id, 'collect_id', collect_id)] += 1
+            counts[
+                (period, start, user_id, 'organization_id', organization_id)
+                ] += 1
+    return counts
+
+
+def apply_rollup_changes(
+        model: type[Model], field: str, changes: dict[tuple, list[int]],
+        ) -> None:
+    """
+    Прибавляет изменения к итогам за период.
+
+    Существующие итоги загружаются одним запросом, изменённые и новые
+    записываются пакетно.
+    """
+    if not changes:
+        return
+    existing = {
+        (getattr(rollup, field), rollup.period, rollup.start): rollup
+        for rollup in model.objects.filter(
+            **{f'{field}__in': {key[0] for key in changes}},
+            period__in={key[1] for key in changes},
+            start__in={key[2] for key in changes},
+            )
+        }
+    created, updated = [], []
+    for (target_id, period, start), (amount, count, donors) in (
+        changes.items()
+    ):
+        rollup = existing.get((target_id, period, start))
+        if rollup is None:
+            rollup = model(**{field: target_id}, period=period, start=start)
+            created.append(rollup)
+        else:
+            updated.append(rollup)
+        rollup.amount += amount
+        rollup.payments_count += count
+        rollup.donors_count += donors
+    model.objects.bulk_create(created)
+    model.objects.bulk_update(
+        updated, ('amount', 'payments_count', 'donors_count'),
+        )
+
+
+def rollup_payments(payments: list[Payment]) -> None:
+    """
+    Переносит платежи в итоги сбора и организации за каждый период.
+
+    Успешный платёж прибавляется, отменённый после учёта вычитается.
+    Жертвователь учитывается в периоде один раз: учтёнными считаются
+    платежи с отметкой is_rolled_up, в том числе ещё не вычтенные.
+    Изменения платежей складываются, и каждый итог меняется один раз.
+    """
+    rolled_up = get_rolled_up_counts(payments)
+    changes = defaultdict(lambda: [0, 0, 0])
+    for payment in payments:
+        sign = 1 if payment.status == 'succeeded' else -1
+        targets = (
+            ('collect_id', payment.collect_id),
+            ('organization_id', payment.collect.organization_id),
+            )
+        for period, _ in ROLLUP_PERIODS:
+            start, _ = get_period_bounds(payment.succeeded_datetime, period)
+            for field, target_id in targets:
+                change = changes[(field, target_id, period, start)]
+                change[0] += sign * payment.payment_amount
+                change[1] += sign
+                if payment.user_id is None:
+                    continue
+                key = (period, start, payment.user_id, field, target_id)
+                others = rolled_up[key] - (sign < 0)
+                change[2] += sign * (not others)
+                rolled_up[key] += sign
+    for model, field in ROLLUP_TARGETS:
+        apply_rollup_changes(
+            model,
+            field,
+            {
+                key[1:]: change for key, change in changes.items()
+                if key[0] == field
+                },
+            )
+    for is_rolled_up in (True, False):
+        Payment.objects.filter(
+            pk__in=[
+                payment.pk for payment in payments
+                if (payment.status == 'succeeded') == is_rolled_up
+                ],
+            ).update(is_rolled_up=is_rolled_up)
+
+
+def rollup_donations(chunk_size: int) -> int:
+    """
+    Переносит в итоги за период новые успешные и отменённые платежи.
+
+    Запуски выполняются по одному под блокировкой в кэше, поэтому
+    пересекающиеся запуски не учитывают жертвователей дважды; запуск,
+    не получивший блокировку, отдаёт 0. Платежи обрабатываются частями,
+    заблокированные сохранением платежа пропускаются. Отдаёт число
+    обработанных платежей.
+    """
+    token = acquire_cache_lock(ROLLUP_LOCK_KEY, ROLLUP_LOCK_TIMEOUT)
+    if token is None:
+        return 0
+    count = 0
+    try:
+        while extend_cache_lock(ROLLUP_LOCK_KEY, token, ROLLUP_LOCK_TIMEOUT):
+            with transaction.atomic():
+                payments = list(
+                    Payment.objects.select_for_update(
+                        skip_locked=True, of=('self',),
+                        ).filter(
+                        Q(status='succeeded', is_rolled_up=False) |
+                        Q(is_rolled_up=True) & ~Q(status='succeeded'),
+                        succeeded_datetime__isnull=False,
+                        ).select_related('collect').order_by(
+                            'pk',
+                            )[:chunk_size]
+                    )
+                if payments:
+                    rollup_payments(payments)
+            count += len(payments)
+            if len(payments) < chunk_size:
+                break
+    finally:
+        release_cache_lock(ROLLUP_LOCK_KEY, token)
+    return count
+
+
+def filter_rollups(
+        queryset: QuerySet[Model],
+        period: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        ) -> QuerySet[Model]:
+    """
+    Отбирает итоги за период в границах дат.
+
+    Без начальной даты отдаются итоги за ROLLUP_DEFAULT_RANGES.
+    """
+    if date_from is None:
+        date_from = (
+            (date_to or timezone.now()) - ROLLUP_DEFAULT_RANGES[period]
+            )
+    queryset = queryset.filter(period=period, start__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(start__lt=date_to)
+    return queryset.order_by('start')
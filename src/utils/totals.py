@@ -0,0 +1,139 @@
+from collections.abc import Iterator
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, F, Model, QuerySet, Sum
+
+from collectings.models import Collect, Payment
+from organizations.models import Organization
+
+PAYMENT_TOTALS_FIELDS = ('collect_id', 'user_id', 'payment_amount', 'status')
+
+
+def get_payment_totals_state(payment: Payment) -> dict[str, Any]:
+    """Отдаёт поля платежа, влияющие на итоги сбора и организации."""
+    return {field: getattr(payment, field) for field in PAYMENT_TOTALS_FIELDS}
+
+
+def change_totals(state: dict[str, Any], sign: int, exclude_pk: int) -> None:
+    """
+    Прибавляет или вычитает успешный платёж из итогов.
+
+    Строка организации блокируется, поэтому жертвователь учитывается
+    один раз при одновременной обработке его платежей.
+    Вызывается внутри транзакции.
+    """
+    organization_id = Collect.objects.filter(
+        pk=state['collect_id'],
+        ).values_list('organization_id', flat=True).get()
+    list(
+        Organization.objects.select_for_update().filter(
+            pk=organization_id,
+            ).values_list('pk', flat=True)
+        )
+    other_payments = Payment.objects.filter(
+        status='succeeded', user_id=state['user_id'],
+        ).exclude(pk=exclude_pk)
+    collect_donor = organization_donor = 0
+    if state['user_id'] is not None:
+        collect_donor = int(
+            not other_payments.filter(collect_id=state['collect_id']).exists()
+            )
+        organization_donor = int(
+            not other_payments.filter(
+                collect__organization_id=organization_id,
+                ).exists()
+            )
+    amount = sign * state['payment_amount']
+    Collect.objects.filter(pk=state['collect_id']).update(
+        collected_amount=F('collected_amount') + amount,
+        donors_count=F('donors_count') + sign * collect_donor,
+        )
+    Organization.objects.filter(pk=organization_id).update(
+        collected_amount=F('collected_amount') + amount,
+        donors_count=F('donors_count') + sign * organization_donor,
+        )
+
+
+def update_totals(
+        old_state: dict[str, Any] | None, payment: Payment,
+        ) -> None:
+    """
+    Переносит изменение платежа в итоги сбора и организации.
+
+    Вызывается внутри транзакции после сохранения платежа.
+    """
+    new_state = get_payment_totals_state(payment)
+    if old_state == new_state:
+        return
+    if old_state is not None and old_state['status'] == 'succeeded':
+        change_totals(old_state, -1, payment.pk)
+    if new_state['status'] == 'succeeded':
+        change_totals(new_state, 1, payment.pk)
+
+
+def _chunks(queryset: QuerySet[Model], chunk_size: int) -> Iterator[list]:
+    """Отдаёт первичные ключи queryset частями."""
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = 0
+    while chunk := list(pks.filter(pk__gt=last_pk)[:chunk_size]):
+        yield chunk
+        last_pk = chunk[-1]
+
+
+def _reconcile_model(
+        model: type[Model], lookup: str, chunk_size: int,
+        ) -> int:
+    """
+    Пересчитывает итоги модели частями, отдаёт число исправленных.
+
+    Строки части блокируются до подсчёта платежей, поэтому платёж,
+    сохранённый во время пересчёта, не теряется и не учитывается дважды.
+    """
+    fixed = 0
+    for chunk in _chunks(model.objects.all(), chunk_size):
+        with transaction.atomic():
+            objs = list(
+                model.objects.select_for_update().filter(
+                    pk__in=chunk,
+                    ).only('collected_amount', 'donors_count')
+                )
+            totals = {
+                row[lookup]: row
+                for row in Payment.objects.filter(
+                    status='succeeded', **{f'{lookup}__in': chunk},
+                    ).values(lookup).annotate(
+                        amount=Sum('payment_amount'),
+                        donors=Count('user', distinct=True),
+                        )
+                }
+            changed = []
+            for obj in objs:
+                total = totals.get(obj.pk, {})
+                amount = total.get('amount') or 0
+                donors = total.get('donors') or 0
+                if (obj.collected_amount, obj.donors_count) != (
+                    amount, donors,
+                ):
+                    obj.collected_amount = amount
+                    obj.donors_count = donors
+                    changed.append(obj)
+            model.objects.bulk_update(
+                changed, ('collected_amount', 'donors_count'),
+                )
+        fixed += len(changed)
+    return fixed
+
+
+def reconcile_totals(chunk_size: int) -> tuple[int, int]:
+    """
+    Пересчитывает итоги сборов и организаций по успешным платежам.
+
+    Отдаёт число исправленных сборов и организаций.
+    """
+    return (
+        _reconcile_model(Collect, 'collect_id', chunk_size),
+        _reconcile_model(
+            Organization, 'collect__organization_id', chunk_size,
+            ),
+        )
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from src.api.v1.parsers import ORJSONParser
+from src.api.v1.renderers import ORJSONRenderer
+
+
+def test_orjson_renderer_matches_json_renderer() -> None:
+    """Тест совпадения вывода orjson с выводом JSONRenderer."""
+    data = {
+        'datetime': datetime(2024, 5, 1, 12, 30, 15, 123456, timezone.utc),
+        'amount': Decimal('10.50'),
+        'label': gettext_lazy('Сбор'),
+        'text': 'строка \u2028 с разделителями \u2029',
+        'items': [1, 2.5, None, True],
+        1: 'ключ-число',
+        }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_parser() -> None:
+    """Тест разбора тела запроса через orjson."""
+    body = JSONRenderer().render({'name': 'Сбор', 'amount': 100})
+    assert (ORJSONParser().parse(BytesIO(body)) ==
+            JSONParser().parse(BytesIO(body)))
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(BytesIO(b'{"name":'))
@@ -0,0 +1,479 @@
+import json
+from base64 import b64encode
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.v1.tasks import create_payment_intent_celery, send_mail_celery
+from collectings.models import Collect, DefaultCover, Payment
+from core.constants import COLLECT_LATEST_PAYMENTS, PAYMENT_INTENT_MAX_RETRIES
+from utils.caching import clean_cache_by_dependencies, local_cache
+from utils.compiled_serializers import CompiledSerializerMixin
+from utils.rollups import rollup_donations
+
+
+@pytest.mark.django_db
+def test_payments_cached_without_queries(
+        payments: list[Payment], django_assert_num_queries,
+        ) -> None:
+    """Тест вывода закэшированных платежей без запросов к БД."""
+    client = APIClient()
+    client.force_authenticate(payments[0].user)
+    response = client.get('/api/v1/payments/')
+    with django_assert_num_queries(0):
+        assert client.get('/api/v1/payments/').data == response.data
+
+
+@pytest.mark.django_db
+def test_collect_pages_use_cached_pks(payments: list[Payment]) -> None:
+    """Тест пагинации сборов по закэшированным первичным ключам."""
+    client = APIClient()
+    client.get('/api/v1/collectings/?order_by=count_amount&limit=1')
+    with CaptureQueriesContext(connection) as context:
+        client.get(
+            '/api/v1/collectings/?order_by=count_amount&limit=1&offset=1'
+            )
+    assert not any(
+        'GROUP BY' in query['sql'] for query in context.captured_queries
+        )
+
+
+@pytest.mark.django_db
+def test_collect_cached_rendered_content(payments: list[Payment]) -> None:
+    """Тест отдачи закэшированного тела ответа без рендера."""
+    client = APIClient()
+    response = client.get('/api/v1/collectings/', format='json')
+    cached_response = client.get('/api/v1/collectings/', format='json')
+    assert (not hasattr(cached_response, 'data') and
+            cached_response.content == response.content and
+            cached_response['Content-Type'] == response['Content-Type'])
+
+
+@pytest.mark.django_db
+def test_collect_not_modified(
+        payments: list[Payment], django_assert_num_queries,
+        ) -> None:
+    """Тест условных запросов списка и объекта сбора."""
+    client = APIClient()
+    for url in (
+        '/api/v1/collectings/',
+        f'/api/v1/collectings/{payments[0].collect.slug}/',
+    ):
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response['ETag'] == etag
+
+
+@pytest.mark.django_db
+def test_collect_clean_only_dependent_pages(
+        payments: list[Payment], django_assert_num_queries,
+        ) -> None:
+    """Тест очистки только страниц, содержащих изменённый сбор."""
+    client = APIClient()
+    first_url = '/api/v1/collectings/?limit=1'
+    second_url = '/api/v1/collectings/?limit=1&offset=1'
+    slug = client.get(first_url).json()['results'][0]['slug']
+    client.get(second_url)
+    clean_cache_by_dependencies(
+        {'collect': {Collect.objects.get(slug=slug).id}}
+        )
+    with django_assert_num_queries(0):
+        client.get(second_url)
+    with CaptureQueriesContext(connection) as context:
+        client.get(first_url)
+    assert context.captured_queries
+
+
+@pytest.mark.django_db
+def test_collect_stats(payments: list[Payment]) -> None:
+    """Тест вывода итогов сбора за период."""
+    payment = payments[0]
+    payment.status = 'succeeded'
+    payment.save()
+    rollup_donations(10)
+    response = APIClient().get(
+        f'/api/v1/collectings/{payment.collect.slug}/stats/',
+        {'period': 'hour'},
+        )
+    assert [
+        (row['amount'], row['donors_count']) for row in response.data
+        ] == [(100, 1)]
+
+
+@pytest.mark.django_db
+def test_collect_latest_payments(payments: list[Payment]) -> None:
+    """Тест вывода сборов без полного списка платежей."""
+    client = APIClient()
+    collect = payments[0].collect
+    results = client.get('/api/v1/collectings/').json()['results']
+    data = client.get(f'/api/v1/collectings/{collect.slug}/').json()
+    assert (all('payments' not in result for result in results) and
+            len(data['payments']) == min(
+                COLLECT_LATEST_PAYMENTS, collect.payments.count(),
+                ))
+
+
+@pytest.mark.django_db
+def test_collect_payments_cursor(payments: list[Payment]) -> None:
+    """Тест постраничного вывода платежей для сбора."""
+    collect = payments[0].collect
+    client = APIClient()
+    url = f'/api/v1/collectings/{collect.slug}/payments/'
+    create_datetimes = []
+    while url:
+        data = client.get(url).json()
+        create_datetimes += [
+            result['create_datetime'] for result in data['results']
+            ]
+        url = data['next']
+    assert (len(create_datetimes) == collect.payments.count() and
+            create_datetimes == sorted(create_datetimes, reverse=True))
+
+
+def count_queries(client: APIClient, url: str) -> int:
+    """Отдаёт число запросов к БД для страницы без кэша."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('url', 'queries'),
+    (('/api/v1/collectings/', 6), ('/api/v1/organizations/', 4)),
+    )
+def test_list_queries_independent_of_page_size(
+        payments: list[Payment], url: str, queries: int,
+        ) -> None:
+    """
+    Тест постоянного числа запросов к БД на страницу списка.
+
+    По два запроса заполняют пустые счётчики итогов сборов
+    и организаций.
+    """
+    client = APIClient()
+    assert (count_queries(client, f'{url}?limit=1') ==
+            count_queries(client, f'{url}?limit=20') == queries)
+
+
+@pytest.mark.django_db
+def test_user_payments_queries_independent_of_count(
+        payments: list[Payment],
+        ) -> None:
+    """Тест загрузки сборов платежей пользователя одним запросом."""
+    client = APIClient()
+    client.force_authenticate(payments[0].user)
+    assert count_queries(client, '/api/v1/payments/') == 1
+
+
+@pytest.mark.django_db
+def test_collect_sparse_fields(payments: list[Payment]) -> None:
+    """Тест вывода выбранных полей без загрузки остальных."""
+    client = APIClient()
+    with CaptureQueriesContext(connection) as context:
+        data = client.get(
+            '/api/v1/collectings/',
+            {'fields': 'name,slug,organization.name', 'omit': 'slug'},
+            ).json()
+    full_data = client.get('/api/v1/collectings/').json()
+    assert (
+        data['results'][0].keys() == {'name', 'organization'} and
+        data['results'][0]['organization'].keys() == {'name'} and
+        'description' in full_data['results'][0] and
+        not any(
+            '"description"' in query['sql']
+            for query in context.captured_queries
+            )
+        )
+
+
+@pytest.mark.django_db
+def test_collect_omit_relation_queries(payments: list[Payment]) -> None:
+    """Тест постоянного числа запросов без вложенной организации."""
+    client = APIClient()
+    url = '/api/v1/collectings/?omit=organization'
+    assert (count_queries(client, f'{url}&limit=1') ==
+            count_queries(client, f'{url}&limit=20') == 4)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('order_by', 'ordering'),
+    (
+        ('', ('name',)),
+        ('-count_amount', ('-collected_amount', '-pk')),
+        ('create_datetime', ('create_datetime', 'pk')),
+        (
+            '-count_amount,create_datetime',
+            ('-collected_amount', 'create_datetime', 'pk'),
+        ),
+    ),
+    )
+def test_collect_keyset_pages(
+        collectings: list[Collect], order_by: str, ordering: tuple[str],
+        ) -> None:
+    """Тест обхода сборов keyset пагинацией без пропусков и повторов."""
+    for index, collect in enumerate(collectings):
+        Collect.objects.filter(pk=collect.pk).update(
+            collected_amount=index % 3,
+            )
+    client = APIClient()
+    expected = list(
+        Collect.objects.order_by(*ordering).values_list('slug', flat=True)
+        )
+    slugs = []
+    data = client.get(
+        '/api/v1/collectings/',
+        {'order_by': order_by, 'limit': 4, 'cursor': ''},
+        ).json()
+    while True:
+        slugs += [result['slug'] for result in data['results']]
+        if not data['next']:
+            break
+        last = data
+        data = client.get(data['next']).json()
+    previous = client.get(data['previous']).json()
+    assert (slugs == expected and 'count' not in data and
+            previous['results'] == last['results'])
+
+
+@pytest.mark.django_db
+def test_collect_live_totals(payments: list[Payment]) -> None:
+    """Тест вывода итогов сборов и организаций из счётчиков Redis."""
+    client = APIClient()
+    collect = payments[0].collect
+    url = f'/api/v1/collectings/{collect.slug}/'
+    client.get(url)
+    Collect.objects.filter(pk=collect.pk).update(collected_amount=1000)
+    cache.delete_many(
+        [key for key in cache.keys('*') if 'live' not in key]
+        )
+    data = client.get(url).json()
+    results = client.get('/api/v1/collectings/').json()['results']
+    assert (data['count_amount'], data['count_donaters']) == (0, 0)
+    organizations = client.get('/api/v1/organizations/').json()['results']
+    assert all(result['count_amount'] == 0 for result in results)
+    assert all(
+        result['organization']['count_donaters'] == 0 for result in results
+        )
+    assert all(
+        organization['count_donaters'] == 0 for organization in organizations
+        )
+
+
+@pytest.mark.django_db
+def test_collect_keyset_row_comparison(collectings: list[Collect]) -> None:
+    """Тест отбора страницы сравнением строки полей без OR."""
+    cache.clear()
+    client = APIClient()
+    data = client.get(
+        '/api/v1/collectings/',
+        {'order_by': '-count_amount', 'limit': 4, 'cursor': ''},
+        ).json()
+    with CaptureQueriesContext(connection) as context:
+        client.get(data['next'])
+    assert any(
+        '"collectings_collect"."id") < (' in query['sql'] and
+        ' OR ' not in query['sql']
+        for query in context.captured_queries
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'position', (['abc', 'xyz'], [{'a': 1}, 1], [None, None]),
+    )
+def test_collect_keyset_invalid_cursor_values(
+        collectings: list[Collect], position: list,
+        ) -> None:
+    """Тест ответа 404 на курсор со значениями неверного типа."""
+    cursor = b64encode(json.dumps({'p': position, 'r': 0}).encode()).decode()
+    response = APIClient().get(
+        '/api/v1/collectings/', {'cursor': cursor, 'limit': 4},
+        )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url',
+    (
+        '/api/v1/collectings/',
+        '/api/v1/collectings/?fields=name,cover,organization.name',
+        '/api/v1/collectings/?cursor=&order_by=-count_amount',
+        '/api/v1/organizations/',
+        '/api/v1/problems/',
+        '/api/v1/regions/',
+        '/api/v1/occansions/',
+        '/api/v1/default-covers/',
+    ),
+    )
+def test_compiled_serializer_identical(
+        collectings: list[Collect], monkeypatch: pytest.MonkeyPatch, url: str,
+        ) -> None:
+    """Тест совпадения вывода скомпилированного и обычного сериализатора."""
+    Collect.objects.filter(pk=collectings[0].pk).update(
+        cover='covers/обложка 1.png',
+        image='covers/image.png',
+        url_video='https://www.youtube.com/watch?v=test',
+        close_datetime=timezone.now(),
+        required_amount=1000,
+        )
+    DefaultCover.objects.create(
+        name='test', default_cover='default_cover/test.png',
+        )
+    client = APIClient()
+    cache.clear()
+    local_cache.clear()
+    compiled = client.get(url).content
+    monkeypatch.setattr(
+        CompiledSerializerMixin, 'use_compiled_serializer', False,
+        )
+    cache.clear()
+    local_cache.clear()
+    assert client.get(url).content == compiled
+
+
+@pytest.mark.django_db
+def test_collect_update_without_refetch(
+        payments: list[Payment], django_assert_max_num_queries,
+        ) -> None:
+    """Тест вывода изменённого сбора без повторной загрузки."""
+    collect = Collect.objects.get(pk=payments[0].collect_id)
+    client = APIClient()
+    client.force_authenticate(collect.user)
+    with django_assert_max_num_queries(8):
+        response = client.patch(
+            f'/api/v1/collectings/{collect.slug}/',
+            {'name': 'Новое название'},
+            format='json',
+            )
+    detail = client.get(f'/api/v1/collectings/{response.data["slug"]}/')
+    assert response.content == detail.content
+
+
+@pytest.mark.django_db
+def test_collect_update_keeps_totals(payments: list[Payment]) -> None:
+    """Тест изменения сбора во время успешной оплаты."""
+    collect = Collect.objects.get(pk=payments[0].collect_id)
+    client = APIClient()
+    client.force_authenticate(collect.user)
+    client.get(f'/api/v1/collectings/{collect.slug}/')
+    payments[0].status = 'succeeded'
+    payments[0].save()
+    response = client.patch(
+        f'/api/v1/collectings/{collect.slug}/',
+        {'name': 'Новое название'},
+        format='json',
+        )
+    client.delete(f'/api/v1/collectings/{response.data["slug"]}/')
+    collect.refresh_from_db()
+    assert (collect.collected_amount, collect.donors_count) == (100, 1)
+    assert not collect.is_active
+
+
+@pytest.mark.django_db
+def test_payment_create_without_refetch(
+        collectings: list[Collect],
+        monkeypatch: pytest.MonkeyPatch,
+        django_assert_max_num_queries,
+        ) -> None:
+    """Тест создания платежа без повторной загрузки сбора."""
+    created = []
+    monkeypatch.setattr(
+        'api.v1.views.create_payment',
+        lambda collect, *args: created.append(collect) or 'https://pay/',
+        )
+    monkeypatch.setattr(
+        'api.v1.views.send_mail_celery.delay', lambda *args: None,
+        )
+    collect = collectings[0]
+    client = APIClient()
+    client.force_authenticate(collect.user)
+    with django_assert_max_num_queries(5):
+        response = client.post(
+            '/api/v1/payments/',
+            {
+                'collect': collect.slug,
+                'payment_amount': 100,
+                'user_first_name': 'Иван',
+                'user_last_name': 'Иванов',
+                },
+            format='json',
+            )
+    assert (response.data == {'confirmation_url': 'https://pay/'} and
+            created[0].slug == collect.slug and
+            Payment.objects.get(collect=collect).confirmation_url ==
+            'https://pay/')
+
+
+@pytest.mark.django_db
+def test_payment_create_async(
+        collectings: list[Collect],
+        fake_yookassa,
+        monkeypatch: pytest.MonkeyPatch,
+        settings,
+        django_capture_on_commit_callbacks,
+        ) -> None:
+    """Тест создания платежа в ЮKassa задачей после ответа 202."""
+    settings.PAYMENTS_ASYNC = True
+    payment_ids = []
+    monkeypatch.setattr(
+        create_payment_intent_celery, 'delay', payment_ids.append,
+        )
+    monkeypatch.setattr(send_mail_celery, 'delay', lambda *args: None)
+    collect = collectings[0]
+    client = APIClient()
+    client.force_authenticate(collect.user)
+    for _ in range(2):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                '/api/v1/payments/',
+                {
+                    'collect': collect.slug,
+                    'payment_amount': 100,
+                    'user_first_name': 'Иван',
+                    'user_last_name': 'Иванов',
+                    },
+                format='json',
+                )
+        assert (response.status_code == 202 and
+                response['Location'] == response.data['status_url'] and
+                not fake_yookassa.requests)
+    pending = client.get(response.data['status_url'])
+    assert (pending.status_code == 202 and
+            pending.data['intent_status'] == 'created' and
+            pending['Retry-After'])
+    for payment_id in payment_ids:
+        create_payment_intent_celery(payment_id)
+    confirmation = client.get(response.data['status_url'])
+    assert (confirmation.status_code == 200 and
+            'Retry-After' not in confirmation and
+            confirmation.data['intent_status'] == 'ready' and
+            confirmation.data['confirmation_url'] ==
+            'https://yookassa.test/2')
+    assert (len({address for address, *_ in fake_yookassa.requests}) == 1 and
+            fake_yookassa.requests[1][1]['Idempotence-Key'] ==
+            f'payment-{payment_ids[1]}')
+
+
+@pytest.mark.django_db
+def test_payment_intent_failed(
+        collectings: list[Collect], fake_yookassa,
+        ) -> None:
+    """Тест отметки ошибки создания платежа после повторов задачи."""
+    fake_yookassa.fail = True
+    collect = collectings[0]
+    payment = Payment.objects.create(
+        user=collect.user, collect=collect, payment_amount=100,
+        )
+    create_payment_intent_celery.apply(args=(payment.id,))
+    payment.refresh_from_db()
+    assert (payment.intent_status == 'failed' and
+            len(fake_yookassa.requests) == PAYMENT_INTENT_MAX_RETRIES + 1)
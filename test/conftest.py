@@ -1,8 +1,13 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from random import choice
+from threading import Thread
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from faker import Faker
+from yookassa import Configuration
 
 from collectings.models import Collect, Occasion, Payment
 from core.management.commands.moke_data import Command
@@ -13,6 +18,18 @@ User = get_user_model()
 fake = Faker('ru-RU')
 
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path) -> None:
+    """Сохраняет файлы тестов во временный каталог."""
+    settings.MEDIA_ROOT = tmp_path / 'media'
+
+
+@pytest.fixture(autouse=True)
+def clear_fake_unique() -> None:
+    """Сбрасывает уникальные значения Faker между тестами."""
+    fake.unique.clear()
+
+
 @pytest.fixture
 def users() -> list[CastomUser]:
     """Создание тестовых пользователей."""
@@ -77,3 +94,59 @@ def payments(collectings) -> list[Payment]:
                     )
                 )
     return Payment.objects.bulk_create(payments)
+
+
+class FakeYookassaHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов создания платежа тестовой ЮKassa."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self) -> None:
+        """Создаёт платёж или отвечает ошибкой сервера."""
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server.requests.append((self.client_address, self.headers, body))
+        if server.fail:
+            status, data = 500, {
+                'type': 'error', 'code': 'internal_server_error',
+                }
+        else:
+            number = len(server.requests)
+            status, data = 200, {
+                'id': f'fake-{number}',
+                'status': 'pending',
+                'paid': False,
+                'test': True,
+                'refundable': False,
+                'amount': body['amount'],
+                'created_at': timezone.now().isoformat(),
+                'metadata': body['metadata'],
+                'confirmation': {
+                    'type': 'redirect',
+                    'confirmation_url': f'https://yookassa.test/{number}',
+                    },
+                }
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args) -> None:
+        """Не выводит журнал запросов."""
+
+
+@pytest.fixture
+def fake_yookassa(monkeypatch: pytest.MonkeyPatch) -> ThreadingHTTPServer:
+    """Запускает локальную тестовую ЮKassa."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeYookassaHandler)
+    server.requests = []
+    server.fail = False
+    Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        Configuration, 'api_url', f'http://127.0.0.1:{server.server_port}/v3',
+        )
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,22 @@
+import pytest
+from django_redis.exceptions import CompressorError
+
+from src.utils.cache_compressors import ThresholdCompressor
+
+
+def test_threshold_compressor() -> None:
+    """Тест сжатия только больших значений."""
+    compressor = ThresholdCompressor({'COMPRESS_MIN_LENGTH': 100})
+    small_value = b'a' * 100
+    large_value = b'a' * 1000
+    compressed_value = compressor.compress(large_value)
+    assert (compressor.compress(small_value) == small_value and
+            len(compressed_value) < len(large_value) and
+            compressor.decompress(compressed_value) == large_value)
+
+
+def test_threshold_compressor_not_compressed() -> None:
+    """Тест ошибки распаковки несжатого значения."""
+    compressor = ThresholdCompressor({})
+    with pytest.raises(CompressorError):
+        compressor.decompress(b'a' * 10)
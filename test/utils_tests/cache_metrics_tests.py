@@ -0,0 +1,32 @@
+from utils.cache_metrics import (MemoryMetricsSink, RedisMetricsSink,
+                                 get_metrics_sink, get_root_tag, record,
+                                 render_metrics)
+
+
+def test_get_root_tag() -> None:
+    """Тест корневого тега по ключу кэша."""
+    assert (get_root_tag('collect_queryset_abc:1.2') == 'collect' and
+            get_root_tag('collect_retrieve_slug:0.0') == 'collect' and
+            get_root_tag('payment_queryset_5') == 'payment' and
+            get_root_tag('count_amount_collect_5:0') ==
+            'count_amount_collect')
+
+
+def test_render_metrics() -> None:
+    """Тест вывода метрик в текстовом формате."""
+    assert isinstance(get_metrics_sink(), MemoryMetricsSink)
+    record('hits', 'test_metrics_queryset_1:0.0')
+    record('keys_removed', 'test_metrics_queryset_1:0.0', 2)
+    metrics = render_metrics()
+    assert ('cache_hits_total{tag="test_metrics"}' in metrics and
+            'cache_keys_removed_total{tag="test_metrics"} 2' in metrics)
+
+
+def test_redis_metrics_sink_shared() -> None:
+    """Тест общих счётчиков метрик нескольких процессов."""
+    first, second = RedisMetricsSink(), RedisMetricsSink()
+    before = first.collect().get(('sets', 'test_shared'), 0)
+    first.incr('sets', 'test_shared')
+    second.incr('sets', 'test_shared', 2)
+    first.flush()
+    assert second.collect()[('sets', 'test_shared')] == before + 3
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from collectings.models import Occasion
+from config.celery import app
+from core.constants import WARM_CACHE_KEY
+from utils.cache_warming import warm_cache, warm_cache_on_invalidate
+
+
+@pytest.mark.django_db
+def test_warm_cache(
+        occasions: list[Occasion], django_assert_num_queries,
+        ) -> None:
+    """Тест заполнения кэша справочника."""
+    assert warm_cache(('occasions',)) == 1
+    with django_assert_num_queries(0):
+        response = APIClient().get('/api/v1/occansions/')
+    assert len(response.json()) == len(occasions)
+
+
+@override_settings(CACHE_WARM_ON_INVALIDATE=True)
+def test_warm_cache_on_invalidate() -> None:
+    """Тест объединения задач заполнения кэша после очистки тега."""
+    cache.delete(WARM_CACHE_KEY.format('collect'))
+    with patch.object(app, 'send_task') as send_task:
+        warm_cache_on_invalidate('collect_queryset')
+        warm_cache_on_invalidate('collect')
+        warm_cache_on_invalidate('collect_retrieve_test')
+    send_task.assert_called_once()
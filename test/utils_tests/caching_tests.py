@@ -1,20 +1,213 @@
+from time import time
+
+import pytest
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.v1.views import OrganizationView
+from src.utils.caching import (MISSING, CacheEntry, DataCachedMixin,
+                               acquire_cache_lock, add_cache_dependencies,
+                               cache_get, cache_set,
+                               clean_cache_by_dependencies, clean_cache_by_tag,
+                               clean_group_cache_by_tags, get_cache_key,
+                               get_cache_timeout, get_or_set_cache,
+                               get_stale_cache_key, release_cache_lock)
+from utils.cache_metrics import get_metrics_sink
 
-from src.utils.caching import clean_cache_by_tag, clean_group_cache_by_tags
+factory = APIRequestFactory()
 
 
 def test_clean_cache_by_tag() -> None:
     """Тест очистки кэша по тегу."""
-    cache.set('test_1', 'test')
-    clean_cache_by_tag('test_')
-    assert cache.get('test_1') is None
+    cache.set(get_cache_key('test'), 'test')
+    clean_cache_by_tag('test')
+    assert cache.get(get_cache_key('test')) is None
+
+
+def test_clean_cache_by_parent_tag() -> None:
+    """Тест очистки кэша по родительскому тегу."""
+    tags_cache = ('test', 'test_queryset')
+    cache.set(get_cache_key(*tags_cache, params='_1'), 'test')
+    clean_cache_by_tag(tags_cache[0])
+    assert cache.get(get_cache_key(*tags_cache, params='_1')) is None
+
+
+def test_clean_cache_by_tag_other_tag() -> None:
+    """Тест сохранения кэша другого тега."""
+    cache.set(get_cache_key('test_other'), 'test')
+    clean_cache_by_tag('test')
+    assert cache.get(get_cache_key('test_other')) == 'test'
 
 
 def test_clean_group_cache_by_tags() -> None:
     """Тест очистки кэша по тегам."""
-    tags_cache = ('test_1_', 'test_2_')
-    cache.set(f'{tags_cache[0]}1', 'test')
-    cache.set(f'{tags_cache[1]}2', 'test')
+    tags_cache = ('test_1', 'test_2')
+    cache.set(get_cache_key(tags_cache[0]), 'test')
+    cache.set(get_cache_key(tags_cache[1]), 'test')
     clean_group_cache_by_tags(tags_cache)
-    assert (cache.get(f'{tags_cache[0]}1') is None and
-            cache.get(f'{tags_cache[1]}2') is None)
+    assert (cache.get(get_cache_key(tags_cache[0])) is None and
+            cache.get(get_cache_key(tags_cache[1])) is None)
+
+
+def test_cache_get_empty_value() -> None:
+    """Тест различения сохранённого None и отсутствия ключа."""
+    key = get_cache_key('test_empty')
+    assert cache_get(key, MISSING) is MISSING
+    cache_set(key, None)
+    assert cache_get(key, MISSING) is None
+
+
+def test_get_or_set_cache() -> None:
+    """Тест вычисления значения один раз."""
+    calls = []
+    key = get_cache_key('test_compute')
+    for _ in range(2):
+        value = get_or_set_cache(key, lambda: calls.append(1) or 'test')
+    assert value == 'test' and len(calls) == 1
+
+
+def test_get_or_set_cache_single_flight_stale() -> None:
+    """Тест отдачи устаревшей копии при занятой блокировке."""
+    tags_cache = ('test_stale', 'test_stale_queryset')
+    stale_key = get_stale_cache_key(*tags_cache)
+    get_or_set_cache(
+        get_cache_key(*tags_cache), lambda: 'stale',
+        stale_key=stale_key, single_flight=True,
+        )
+    clean_cache_by_tag(tags_cache[0])
+    key = get_cache_key(*tags_cache)
+    cache.add(f'{key}:lock', 1)
+    value = get_or_set_cache(
+        key, lambda: 'fresh', stale_key=stale_key, single_flight=True,
+        )
+    cache.delete(f'{key}:lock')
+    assert value == 'stale'
+
+
+def test_release_cache_lock_keeps_other_lock() -> None:
+    """Тест сохранения блокировки, захваченной другим запросом."""
+    lock_key = f'{get_cache_key("test_lock")}:lock'
+    token = acquire_cache_lock(lock_key)
+    assert acquire_cache_lock(lock_key) is None
+    cache.set(lock_key, 'other')
+    release_cache_lock(lock_key, token)
+    assert cache.get(lock_key) == 'other'
+    cache.set(lock_key, token)
+    release_cache_lock(lock_key, token)
+    assert cache.get(lock_key) is None
+
+
+def test_clean_cache_by_dependencies_records_removed_keys() -> None:
+    """Тест удаления зависимых ключей с учётом метрики."""
+    key = get_cache_key('test_removed', 'test_removed_queryset')
+    cache_set(key, 'value')
+    cache_set(f'{key}:meta', 'meta')
+    add_cache_dependencies(key, {'test_removed': {1}})
+    before = get_metrics_sink().collect().get(
+        ('keys_removed', 'test_removed'), 0,
+        )
+    clean_cache_by_dependencies({'test_removed': {1}})
+    assert (cache.get(key) is None and
+            get_metrics_sink().collect()[('keys_removed', 'test_removed')] ==
+            before + 2)
+
+
+def test_dependent_cache_cleaned_during_compute() -> None:
+    """Тест удаления значения, посчитанного во время очистки кэша."""
+    view = type(
+        'DependentView',
+        (DataCachedMixin,),
+        {'cache_dependencies': {'test_generation': 'pk'}},
+        )()
+    view.request = Request(factory.get('/'))
+    key = get_cache_key('test_generation')
+
+    def compute() -> str:
+        clean_cache_by_dependencies({'test_generation': {1}})
+        return 'old'
+
+    assert view.get_cached_data(('test_generation',), '', compute) == 'old'
+    assert cache_get(key) is None
+    assert view.get_cached_data(
+        ('test_generation',), '', lambda: 'new',
+        ) == 'new'
+    assert cache_get(key).value == 'new'
+
+
+def test_cache_local_with_dependencies_forbidden() -> None:
+    """Тест запрета кэша процесса вместе с зависимостями."""
+    with pytest.raises(ImproperlyConfigured):
+        type(
+            'LocalDependentView',
+            (DataCachedMixin,),
+            {'cache_local': True, 'cache_dependencies': {'test': 'pk'}},
+            )
+
+
+def test_get_or_set_cache_early_refresh() -> None:
+    """Тест раннего обновления записи перед истечением."""
+    key = get_cache_key('test_early')
+    cache.set(key, CacheEntry('old', 60, time()))
+    value = get_or_set_cache(key, lambda: 'new', early_refresh_beta=1)
+    assert value == 'new'
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        },
+    )
+def test_get_or_set_cache_local() -> None:
+    """Тест кэша процесса и его очистки по тегу."""
+    key = get_cache_key('test_local', local=True)
+    get_or_set_cache(key, lambda: 'test', local=True)
+    cache.delete(key)
+    assert get_or_set_cache(key, lambda: 'new', local=True) == 'test'
+    clean_cache_by_tag('test_local')
+    key = get_cache_key('test_local', local=True)
+    assert get_or_set_cache(key, lambda: 'new', local=True) == 'new'
+
+
+def get_list_cache_params(query: str) -> dict:
+    """Отдаёт параметры кэша списка организаций для запроса."""
+    view = OrganizationView(
+        request=Request(factory.get(f'/{query}')), kwargs={},
+        )
+    return view.get_list_cache_params()
+
+
+def test_list_cache_params_normalized() -> None:
+    """Тест нормализации параметров кэша списка."""
+    assert (
+        get_list_cache_params('?problems=b&problems=a&junk=1&name=') ==
+        get_list_cache_params('?problems=a&problems=b&limit=20&offset=0')
+    )
+
+
+def test_list_cache_params_multiple_values() -> None:
+    """Тест учёта всех значений множественного фильтра."""
+    assert (
+        get_list_cache_params('?problems=a') !=
+        get_list_cache_params('?problems=a&problems=b')
+    )
+
+
+@override_settings(CACHE_TAG_TIMEOUTS={'test_timeout': 10})
+def test_get_cache_timeout() -> None:
+    """Тест времени жизни ключа по тегу."""
+    assert (get_cache_timeout('test_timeout_queryset_1:0.0') == 10 and
+            get_cache_timeout('test_other:0') == cache.default_timeout)
+
+
+def test_list_cache_params_fields() -> None:
+    """Тест учёта выбора полей в параметрах кэша списка."""
+    assert (
+        get_list_cache_params('?fields=slug,name') ==
+        get_list_cache_params('?fields=name&fields=slug,') !=
+        get_list_cache_params('')
+    )
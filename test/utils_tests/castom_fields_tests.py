@@ -1,9 +1,10 @@
 import pytest
 
-from collectings.models import Payment
+from collectings.models import Collect, Payment
+from organizations.models import Organization
 from src.utils.castom_fields import (get_count_amount_collect,
                                      get_count_amount_organization,
-                                     get_count_donaters_collect)
+                                     get_count_donaters_collect, get_counters)
 
 
 @pytest.mark.django_db
@@ -22,6 +23,34 @@ def test_get_count_donaters_collect(payments: list[Payment]) -> None:
 
 @pytest.mark.django_db
 def test_get_count_amount_organization(payments: list[Payment]) -> None:
-    """Тест получения собранной суммы организации."""
+    """Тест получения собранной суммы организации без неоплаченных."""
     organization = payments[0].collect.organization
-    assert get_count_amount_organization(organization) == 12500
+    Payment.objects.filter(collect=payments[0].collect).update(
+        status='succeeded',
+        )
+    assert get_count_amount_organization(organization) == 2500
+
+
+@pytest.mark.django_db
+def test_get_counters_batched(
+        payments: list[Payment], django_assert_num_queries,
+        ) -> None:
+    """Тест вычисления счётчика страницы одним запросом."""
+    organizations = list(Organization.objects.all())
+    with django_assert_num_queries(1):
+        counters = get_counters('count_amount_organization', organizations)
+    with django_assert_num_queries(0):
+        assert get_counters(
+            'count_amount_organization', organizations
+            ) == counters
+
+
+@pytest.mark.django_db
+def test_get_counters_empty_cached(
+        collectings: list[Collect], django_assert_num_queries,
+        ) -> None:
+    """Тест кэширования пустых значений счётчика."""
+    get_counters('count_amount_collect', collectings)
+    with django_assert_num_queries(0):
+        counters = get_counters('count_amount_collect', collectings)
+    assert set(counters.values()) == {None}
@@ -0,0 +1,34 @@
+import pytest
+from django.test import RequestFactory
+
+from collectings.models import Collect
+from src.utils.identity_map import get_identity_map
+
+
+@pytest.mark.django_db
+def test_identity_map_fetch_once(
+        collectings: list[Collect], django_assert_num_queries,
+        ) -> None:
+    """Тест загрузки объекта из БД один раз за запрос."""
+    request = RequestFactory().get('/')
+    slug = collectings[0].slug
+    with django_assert_num_queries(1):
+        collect = get_identity_map(request).fetch(
+            Collect.objects.all(), slug=slug,
+            )
+        assert get_identity_map(request).fetch(
+            Collect.objects.all(), slug=slug,
+            ) is collect
+
+
+@pytest.mark.django_db
+def test_identity_map_load_related(
+        collectings: list[Collect], django_assert_num_queries,
+        ) -> None:
+    """Тест заполнения связей из загруженных объектов."""
+    identity_map = get_identity_map(RequestFactory().get('/'))
+    collect = Collect.objects.get(pk=collectings[0].pk)
+    organization = identity_map.add(collectings[0].organization)
+    with django_assert_num_queries(1):
+        identity_map.load_related(collect, ('organization', 'occasion'))
+    assert collect.organization is organization
@@ -0,0 +1,118 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from collectings.models import Collect, Payment
+from utils.live_counters import (get_live_keys, get_live_organization_totals,
+                                 get_live_totals, reconcile_live_counters)
+
+
+@pytest.mark.django_db
+def test_live_counters(
+        payments: list[Payment],
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+        ) -> None:
+    """Тест счётчиков сбора при успешных платежах."""
+    collect = payments[0].collect
+    reconcile_live_counters((collect.id,))
+    assert get_live_totals(collect.id) == {
+        'count_amount': 0, 'count_donaters': 0,
+        }
+    for payment in collect.payments.all()[:2]:
+        stale = Payment.objects.get(pk=payment.pk)
+        for obj in (payment, stale):
+            obj.status = 'succeeded'
+            with django_capture_on_commit_callbacks(execute=True):
+                obj.save()
+    with django_assert_num_queries(0):
+        totals = get_live_totals(collect.id)
+    assert totals == {'count_amount': 200, 'count_donaters': 2}
+    with django_capture_on_commit_callbacks(execute=True):
+        payment.delete()
+    assert get_live_totals(collect.id) == {
+        'count_amount': 100, 'count_donaters': 1,
+        }
+
+
+@pytest.mark.django_db
+def test_live_organization_totals_without_queries(
+        payments: list[Payment],
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+        ) -> None:
+    """Тест счётчиков организации, обновляемых успешными платежами."""
+    cache.clear()
+    organization = payments[0].collect.organization
+    assert get_live_organization_totals(organization.id) == {
+        'count_amount': 0, 'count_donaters': 0,
+        }
+    succeeded = Payment.objects.filter(
+        collect__organization=organization,
+        ).order_by('user_id', 'collect_id')[:3]
+    for payment in succeeded:
+        payment.status = 'succeeded'
+        with django_capture_on_commit_callbacks(execute=True):
+            payment.save()
+    with django_assert_num_queries(0):
+        totals = get_live_organization_totals(organization.id)
+    assert totals == {
+        'count_amount': 300,
+        'count_donaters': len({payment.user_id for payment in succeeded}),
+        }
+
+
+@pytest.mark.django_db
+@override_settings(LIVE_COUNTERS_APPROXIMATE_DONORS=True)
+def test_live_organization_totals_approximate(
+        payments: list[Payment],
+        ) -> None:
+    """Тест объединения HyperLogLog жертвователей сборов организации."""
+    organization = payments[0].collect.organization
+    user = payments[0].user
+    succeeded = Payment.objects.filter(
+        collect__organization=organization, user=user,
+        )[:2]
+    for payment in succeeded:
+        payment.status = 'succeeded'
+        payment.save()
+    reconcile_live_counters(
+        organization.collectings.values_list('id', flat=True)
+        )
+    assert get_live_organization_totals(organization.id) == {
+        'count_amount': 200, 'count_donaters': 1,
+        }
+
+
+@pytest.mark.django_db
+def test_reconcile_live_counters_amount_only(
+        payments: list[Payment],
+        ) -> None:
+    """Тест пересборки жертвователей только изменённых сборов."""
+    collect = payments[0].collect
+    reconcile_live_counters((collect.id,))
+    donors_key = get_live_keys(collect.id)[1]
+    get_redis_connection().sadd(donors_key, 'extra')
+    Collect.objects.filter(pk=collect.pk).update(collected_amount=300)
+    with CaptureQueriesContext(connection) as context:
+        reconcile_live_counters((collect.id,), timezone.now())
+    assert (
+        get_live_totals(collect.id) == {
+            'count_amount': 300, 'count_donaters': 1,
+            } and
+        not any(
+            'user_id' in query['sql'] for query in context.captured_queries
+            )
+        )
+    changed_since = timezone.now()
+    payment = collect.payments.first()
+    payment.status = 'succeeded'
+    payment.save()
+    reconcile_live_counters((collect.id,), changed_since)
+    assert get_live_totals(collect.id) == {
+        'count_amount': 400, 'count_donaters': 1,
+        }
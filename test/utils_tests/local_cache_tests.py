@@ -0,0 +1,23 @@
+from time import sleep
+
+from src.utils.local_cache import LocalCache
+
+
+def test_local_cache_lru() -> None:
+    """Тест вытеснения давно неиспользуемых значений."""
+    local_cache = LocalCache(2, 60)
+    local_cache.set('test_1', 1)
+    local_cache.set('test_2', 2)
+    local_cache.get('test_1')
+    local_cache.set('test_3', 3)
+    assert (local_cache.get('test_1') == 1 and
+            local_cache.get('test_2') is None and
+            local_cache.get('test_3') == 3)
+
+
+def test_local_cache_timeout() -> None:
+    """Тест истечения значений."""
+    local_cache = LocalCache(2, 60)
+    local_cache.set('test', 1, timeout=0.01)
+    sleep(0.02)
+    assert local_cache.get('test') is None
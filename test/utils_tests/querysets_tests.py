@@ -0,0 +1,28 @@
+from api.v1.serializers import CollectListSerializer, PaymentSerializer
+from collectings.models import Collect, Payment
+from src.utils.querysets import get_query_plan, plan_queryset
+
+
+def test_get_query_plan_nested() -> None:
+    """Тест загрузки вложенных сериализаторов через select_related."""
+    plan = get_query_plan(CollectListSerializer(), Collect)
+    assert (plan.select_related == ['organization', 'occasion'] and
+            plan.use_only and
+            {'collected_amount', 'organization__slug'} <= set(plan.only))
+
+
+def test_get_query_plan_slug_related() -> None:
+    """Тест загрузки поля slug связанного объекта."""
+    plan = get_query_plan(PaymentSerializer(), Payment)
+    assert (plan.select_related == ['collect'] and
+            'collect__slug' in plan.only)
+
+
+def test_plan_queryset_without_relations() -> None:
+    """Тест отсутствия select_related без вложенных полей."""
+    serializer = CollectListSerializer()
+    for name in list(serializer.fields):
+        if name != 'name':
+            serializer.fields.pop(name)
+    queryset = plan_queryset(Collect.objects.all(), serializer)
+    assert queryset.query.select_related is False
@@ -0,0 +1,66 @@
+import pytest
+
+from collectings.models import CollectRollup, Payment
+from core.constants import ROLLUP_LOCK_KEY
+from organizations.models import OrganizationRollup
+from utils.caching import acquire_cache_lock, release_cache_lock
+from utils.rollups import rollup_donations
+
+
+def set_status(payments: list[Payment], status: str) -> None:
+    """Сохраняет платежи с новым статусом."""
+    for payment in payments:
+        payment.status = status
+        payment.save()
+
+
+@pytest.mark.django_db
+def test_rollup_donations(payments: list[Payment]) -> None:
+    """Тест переноса успешных и отменённых платежей в итоги за период."""
+    collect = payments[0].collect
+    user_payments = list(
+        Payment.objects.filter(collect=collect, user=payments[0].user)[:2]
+        )
+    other_payment = collect.payments.exclude(user=payments[0].user).first()
+    set_status([*user_payments, other_payment], 'succeeded')
+    assert rollup_donations(2) == 3
+    rollup = CollectRollup.objects.get(collect=collect, period='day')
+    assert (rollup.amount, rollup.payments_count,
+            rollup.donors_count) == (300, 3, 2)
+    assert OrganizationRollup.objects.get(
+        organization=collect.organization, period='hour',
+        ).donors_count == 2
+    set_status(user_payments, 'canceled')
+    assert rollup_donations(2) == 2
+    rollup.refresh_from_db()
+    assert (rollup.amount, rollup.payments_count,
+            rollup.donors_count) == (100, 1, 1)
+
+
+@pytest.mark.django_db
+def test_rollup_donations_locked(payments: list[Payment]) -> None:
+    """Тест пропуска запуска при незавершённом предыдущем."""
+    set_status(payments[:2], 'succeeded')
+    token = acquire_cache_lock(ROLLUP_LOCK_KEY)
+    assert rollup_donations(10) == 0
+    release_cache_lock(ROLLUP_LOCK_KEY, token)
+    assert rollup_donations(10) == 2
+
+
+@pytest.mark.django_db
+def test_rollup_donations_queries_per_chunk(
+        payments: list[Payment], django_assert_max_num_queries,
+        ) -> None:
+    """Тест постоянного числа запросов на часть платежей."""
+    collect_payments = list(payments[0].collect.payments.all())
+    set_status(collect_payments, 'succeeded')
+    with django_assert_max_num_queries(10):
+        assert rollup_donations(len(collect_payments) + 1) == len(
+            collect_payments,
+            )
+    rollup = CollectRollup.objects.get(
+        collect=payments[0].collect, period='hour',
+        )
+    assert (rollup.amount, rollup.payments_count) == (
+        100 * len(collect_payments), len(collect_payments),
+        )
@@ -0,0 +1,40 @@
+import pytest
+
+from collectings.models import Collect, Payment
+from utils.totals import reconcile_totals
+
+
+def set_status(payments: list[Payment], status: str) -> None:
+    """Сохраняет платежи с новым статусом."""
+    for payment in payments:
+        payment.status = status
+        payment.save()
+
+
+@pytest.mark.django_db
+def test_totals_succeeded_transitions(payments: list[Payment]) -> None:
+    """Тест итогов при переходе платежей в статус succeeded и обратно."""
+    collect = payments[0].collect
+    collect_payments = list(collect.payments.all())
+    set_status(collect_payments, 'succeeded')
+    collect.refresh_from_db()
+    organization = collect.organization
+    organization.refresh_from_db()
+    assert (collect.collected_amount, collect.donors_count) == (2500, 5)
+    assert (organization.collected_amount,
+            organization.donors_count) == (2500, 5)
+    set_status(collect_payments[:1], 'canceled')
+    collect_payments[1].delete()
+    collect.refresh_from_db()
+    assert (collect.collected_amount, collect.donors_count) == (2300, 5)
+
+
+@pytest.mark.django_db
+def test_reconcile_totals(payments: list[Payment]) -> None:
+    """Тест пересчёта итогов по успешным платежам."""
+    Payment.objects.filter(id=payments[0].id).update(status='succeeded')
+    collect = payments[0].collect
+    assert reconcile_totals(2) == (1, 1)
+    collect.refresh_from_db()
+    assert (collect.collected_amount, collect.donors_count) == (100, 1)
+    assert Collect.objects.filter(collected_amount=0).count() == 24